@@ -2,7 +2,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from fastapi import Depends
 from app.security import verify_internal_token
+from app.services.checkpoint import delete_project_checkpoints
 from app.services.delete_vectors import delete_project_vectors
+from app.services.page_store import delete_project_pages
 
 
 router = APIRouter()
@@ -44,6 +46,10 @@ def delete_project(
             detail=f"Vector deletion failed: {str(e)}",
         )
 
+    delete_project_pages(req.project_id)
+    # A resumed ingest would otherwise skip pages it believes are indexed
+    delete_project_checkpoints(req.project_id)
+
     if deleted_count == 0:
         raise HTTPException(
             status_code=404,
@@ -1,9 +1,21 @@
+import hashlib
+import threading
+
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, HttpUrl, Field, model_validator
 
-from app.services.crawl import crawl_site
+from app.services.crawl import CrawlState, crawl_state_from_dict, iter_site
+from app.services.frontier import LargeCrawlState
 from app.services.chunk import chunk_text
 from app.services.embed_and_upsert import upsert_chunks
+from app.services.checkpoint import (
+    IngestLockedError,
+    checkpoint_work_dir,
+    clear_checkpoint,
+    ingest_lock,
+    load_checkpoint,
+    save_checkpoint,
+)
 import app.config as config
 from fastapi import Depends
 from app.security import verify_internal_token
@@ -19,77 +31,232 @@ class IngestRequest(BaseModel):
     max_pages: int = Field(
         default=config.CRAWL_MAX_PAGES,
         ge=1,
-        le=200,
+        le=config.CRAWL_LARGE_MAX_PAGES,
     )
     chunk_token_size: int = Field(
         default=config.CHUNK_TOKEN_SIZE,
         ge=100,
         le=1000,
     )
+    # Retrying with the same ingest_id resumes from the last checkpoint.
+    # Defaults to a hash of the request, so plain retries resume too.
+    ingest_id: str | None = Field(
+        default=None,
+        pattern=r"^[A-Za-z0-9_-]{1,64}$",
+    )
+    # Disk-backed frontier / visited set for sites beyond 200 pages
+    large_crawl: bool = False
+    max_depth: int | None = Field(default=None, ge=0)
+    path_prefix: str | None = Field(default=None, pattern=r"^/")
+
+    @model_validator(mode="after")
+    def _check_page_limit(self):
+        if not self.large_crawl and self.max_pages > 200:
+            raise ValueError("max_pages above 200 requires large_crawl=true")
+        return self
 
 
 # ================== RESPONSE SCHEMA ==================
 
 class IngestResponse(BaseModel):
     project_id: str
+    ingest_id: str
+    resumed: bool
     pages_crawled: int
     chunks_indexed: int
 
 
-# ================== ROUTE ==================
+# ================== HELPERS ==================
 
-@router.post(
-    "/ingest",
-    response_model=IngestResponse,
-    tags=["Projects"],
-)
-def ingest_project(
-    req: IngestRequest,
-    _: None = Depends(verify_internal_token)
-):
+def _request_fields(req: IngestRequest) -> dict:
     """
-    Crawl a website, chunk content, embed, and store in vector DB.
+    Everything that defines an ingest; saved in its checkpoint and
+    compared on resume.
     """
+    return {
+        "project_id": req.project_id,
+        "start_url": str(req.start_url),
+        "max_pages": req.max_pages,
+        "chunk_token_size": req.chunk_token_size,
+        "large_crawl": req.large_crawl,
+        "max_depth": req.max_depth,
+        "path_prefix": req.path_prefix,
+    }
 
-    try:
-        pages = crawl_site(
-            start_url=str(req.start_url),
-            max_pages=req.max_pages,
-        )
-    except Exception:
-        raise HTTPException(
-            status_code=500,
-            detail="Internal error during crawling"
+
+def _default_ingest_id(req: IngestRequest) -> str:
+    key = "\n".join(str(v) for v in _request_fields(req).values())
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def _checkpoint_matches(req: IngestRequest, data: dict) -> bool:
+    return all(data.get(k) == v for k, v in _request_fields(req).items())
+
+
+class _IngestProgress:
+    """
+    Thread-safe checkpoint writer for one ingest.
+
+    Batch completions arrive from scheduler worker threads, so every
+    mutation + save happens under a lock.
+    """
+
+    def __init__(self, req: IngestRequest, ingest_id: str, data: dict | None):
+        self.req = req
+        self.ingest_id = ingest_id
+        self.resumed = data is not None
+        self._lock = threading.Lock()
+
+        data = data or {}
+        if "crawl" in data:
+            self.crawl = crawl_state_from_dict(data["crawl"])
+        elif req.large_crawl:
+            self.crawl = LargeCrawlState.start(
+                checkpoint_work_dir(req.project_id, ingest_id),
+                str(req.start_url),
+            )
+        else:
+            self.crawl = CrawlState.start(str(req.start_url))
+        self.pages_crawled = data.get("pages_crawled", 0)
+        self.chunks_indexed = data.get("chunks_indexed", 0)
+        self.pending = data.get("pending")
+
+    def _save(self) -> None:
+        save_checkpoint(
+            self.req.project_id,
+            self.ingest_id,
+            {
+                **_request_fields(self.req),
+                "crawl": self.crawl.to_dict(),
+                "pages_crawled": self.pages_crawled,
+                "chunks_indexed": self.chunks_indexed,
+                "pending": self.pending,
+            },
         )
 
+    def begin_page(self, url: str, text: str) -> None:
+        with self._lock:
+            self.pending = {"url": url, "text": text, "done_batches": []}
+            self._save()
 
-    total_chunks = 0
+    def batch_done(self, index: int) -> None:
+        with self._lock:
+            self.pending["done_batches"].append(index)
+            self._save()
+
+    def end_page(self, chunks_indexed: int) -> None:
+        with self._lock:
+            self.pages_crawled += 1
+            self.chunks_indexed += chunks_indexed
+            self.pending = None
+            self._save()
+
+
+def _run_ingest(req: IngestRequest, ingest_id: str) -> IngestResponse:
+    """
+    One attempt of an ingest; the caller holds its ingest lock.
+    """
 
-    for page in pages:
-        text = page.get("text", "").strip()
-        url = page.get("url")
+    checkpoint = load_checkpoint(req.project_id, ingest_id)
+    if checkpoint is not None and not _checkpoint_matches(req, checkpoint):
+        raise HTTPException(
+            status_code=409,
+            detail=f"ingest_id={ingest_id} belongs to an ingest with different parameters",
+        )
 
-        if not text:
-            continue
+    progress = _IngestProgress(req, ingest_id, checkpoint)
 
+    def _index_page(url: str, text: str, done_batches=()) -> None:
         chunks = chunk_text(
             text=text,
             max_tokens=req.chunk_token_size,
         )
 
-        if not chunks:
-            continue
+        if chunks:
+            upsert_chunks(
+                project_id=req.project_id,
+                url=url,
+                chunks=chunks,
+                done_batches=set(done_batches),
+                on_batch=progress.batch_done,
+            )
+
+        # Batches skipped on resume were upserted by an earlier attempt
+        progress.end_page(len(chunks))
+
+    try:
+        # Finish the page that was in flight when the last attempt stopped
+        if progress.pending:
+            _index_page(
+                progress.pending["url"],
+                progress.pending["text"],
+                progress.pending["done_batches"],
+            )
+
+        for page in iter_site(
+            start_url=str(req.start_url),
+            max_pages=req.max_pages,
+            state=progress.crawl,
+            cache_project_id=req.project_id,
+            max_depth=req.max_depth,
+            path_prefix=req.path_prefix,
+        ):
+            text = page.get("text", "").strip()
+            url = page.get("url")
+
+            if not text:
+                continue
 
-        inserted = upsert_chunks(
-            project_id=req.project_id,
-            url=url,
-            chunks=chunks,
+            progress.begin_page(url, text)
+            _index_page(url, text)
+
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ingest interrupted; retry with ingest_id={ingest_id} to resume",
         )
 
-        total_chunks += inserted
+    finally:
+        if isinstance(progress.crawl, LargeCrawlState):
+            progress.crawl.close()
+
+    clear_checkpoint(req.project_id, ingest_id)
 
     return IngestResponse(
         project_id=req.project_id,
-        pages_crawled=len(pages),
-        chunks_indexed=total_chunks,
+        ingest_id=ingest_id,
+        resumed=progress.resumed,
+        pages_crawled=progress.pages_crawled,
+        chunks_indexed=progress.chunks_indexed,
     )
+
+
+# ================== ROUTE ==================
+
+@router.post(
+    "/ingest",
+    response_model=IngestResponse,
+    tags=["Projects"],
+)
+def ingest_project(
+    req: IngestRequest,
+    _: None = Depends(verify_internal_token)
+):
+    """
+    Crawl a website, chunk content, embed, and store in vector DB.
+
+    Progress is checkpointed after every page and embedding batch; a
+    retried ingest continues where the previous attempt stopped. A retry
+    that arrives while the previous attempt is still running gets a 409.
+    """
+
+    ingest_id = req.ingest_id or _default_ingest_id(req)
+
+    try:
+        with ingest_lock(req.project_id, ingest_id):
+            return _run_ingest(req, ingest_id)
+    except IngestLockedError:
+        raise HTTPException(
+            status_code=409,
+            detail=f"ingest_id={ingest_id} is already running; retry once it finishes",
+        )
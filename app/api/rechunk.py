@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+
+from app.services.chunk import chunk_text
+from app.services.delete_vectors import delete_url_vectors
+from app.services.embed_and_upsert import point_id, upsert_chunks
+from app.services.page_store import iter_pages
+import app.config as config
+from app.security import verify_internal_token
+
+router = APIRouter()
+
+
+# ================== REQUEST SCHEMA ==================
+
+class RechunkRequest(BaseModel):
+    project_id: str = Field(..., min_length=3)
+    chunk_token_size: int = Field(
+        default=config.CHUNK_TOKEN_SIZE,
+        ge=100,
+        le=1000,
+    )
+
+
+# ================== RESPONSE SCHEMA ==================
+
+class RechunkResponse(BaseModel):
+    project_id: str
+    pages_rechunked: int
+    chunks_indexed: int
+
+
+# ================== ROUTE ==================
+
+@router.post(
+    "/rechunk",
+    response_model=RechunkResponse,
+    tags=["Projects"],
+)
+def rechunk_project(
+    req: RechunkRequest,
+    _: None = Depends(verify_internal_token)
+):
+    """
+    Rebuild chunks and embeddings from the local page store, without
+    refetching any page. Stale chunks of each page are removed.
+    """
+
+    pages_rechunked = 0
+    total_chunks = 0
+
+    try:
+        for page in iter_pages(req.project_id):
+            text = page.get("text", "").strip()
+            url = page.get("url")
+
+            if not text:
+                continue
+
+            chunks = chunk_text(
+                text=text,
+                max_tokens=req.chunk_token_size,
+            )
+
+            if chunks:
+                total_chunks += upsert_chunks(
+                    project_id=req.project_id,
+                    url=url,
+                    chunks=chunks,
+                )
+
+            delete_url_vectors(
+                req.project_id,
+                url,
+                keep_ids=[point_id(req.project_id, url, c) for c in chunks],
+            )
+
+            pages_rechunked += 1
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Rechunk failed: {str(e)}",
+        )
+
+    if pages_rechunked == 0:
+        raise HTTPException(
+            status_code=404,
+            detail="No cached pages for this project_id; run /ingest first",
+        )
+
+    return RechunkResponse(
+        project_id=req.project_id,
+        pages_rechunked=pages_rechunked,
+        chunks_indexed=total_chunks,
+    )
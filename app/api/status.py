@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends
+
+from app.security import verify_internal_token
+from app.services.crawl import fetch_stats
+from app.services.resilience import backend_stats
+from app.startup import startup_report
+from app.services.scheduler import get_scheduler
+
+
+router = APIRouter()
+
+
+# ================== ROUTES ==================
+
+@router.get("/scheduler")
+def scheduler_status(
+    _: None = Depends(verify_internal_token)
+):
+    """
+    Per-project queue depths of the ingestion scheduler.
+    """
+
+    scheduler = get_scheduler()
+
+    return {
+        "workers": scheduler.workers,
+        "project_concurrency": scheduler.project_concurrency,
+        "tokens_per_minute": scheduler.tokens_per_minute,
+        "projects": scheduler.queue_depths(),
+    }
+
+
+@router.get("/startup")
+def startup_status(
+    _: None = Depends(verify_internal_token)
+):
+    """
+    Import and initialization cost of this worker process.
+    """
+
+    return startup_report()
+
+
+@router.get("/crawl")
+def crawl_status(
+    _: None = Depends(verify_internal_token)
+):
+    """
+    Crawl transfer counters, including bytes downloaded and discarded.
+    """
+
+    return fetch_stats()
+
+
+@router.get("/backends")
+def backends_status(
+    _: None = Depends(verify_internal_token)
+):
+    """
+    Circuit-breaker state, latency and hedge win rate per backend.
+    """
+
+    return backend_stats()
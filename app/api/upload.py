@@ -1,15 +1,40 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from fastapi.concurrency import run_in_threadpool
 
+from app.security import verify_internal_token
+
 from app.services.chunk import chunk_text
-from app.services.embed_and_upsert import upsert_chunks
+from app.services.embed_and_upsert import SharedBatchUpserter, upsert_chunks
+from app.services.scheduler import PRIORITY_INTERACTIVE
+import app.config as config
 
 import io
 import csv
-from PyPDF2 import PdfReader
+import tarfile
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
 router = APIRouter()
 
+SUPPORTED_EXTENSIONS = {"txt", "csv", "pdf"}
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# Raised while decompressing a single archive member: encrypted (RuntimeError),
+# unsupported method (NotImplementedError), corrupt / truncated data
+MEMBER_READ_ERRORS = (
+    RuntimeError,
+    NotImplementedError,
+    EOFError,
+    OSError,
+    zlib.error,
+    zipfile.BadZipFile,
+    tarfile.TarError,
+)
+
 
 def extract_text(filename: str, content: bytes) -> str:
     ext = filename.lower().split(".")[-1]
@@ -25,6 +50,8 @@ def extract_text(filename: str, content: bytes) -> str:
         return text
 
     if ext == "pdf":
+        from PyPDF2 import PdfReader
+
         text = ""
         reader = PdfReader(io.BytesIO(content))
 
@@ -62,7 +89,8 @@ async def upload_file(
             upsert_chunks,
             project_id,
             file.filename,
-            chunks
+            chunks,
+            priority=PRIORITY_INTERACTIVE,
         )
 
         return {
@@ -77,3 +105,174 @@ async def upload_file(
     except Exception as e:
         print("UPLOAD_ERROR:", e)
         raise HTTPException(500, f"Upload failed: {str(e)}")
+
+
+# ================== BULK UPLOAD ==================
+
+def _check_entry(name: str, size: int) -> Optional[str]:
+    """
+    Reason to skip an archive member, or None if it should be indexed.
+    """
+
+    if name.lower().split(".")[-1] not in SUPPORTED_EXTENSIONS:
+        return "Unsupported file type"
+    if size > config.BULK_UPLOAD_MAX_ENTRY_BYTES:
+        return "File too large"
+    return None
+
+
+def _iter_entries(
+    files: List[UploadFile],
+) -> Iterator[Tuple[str, Optional[bytes], Optional[str], Optional[str]]]:
+    """
+    Yield (name, content, status, detail) for every uploaded file and
+    every member of uploaded ZIP / TAR archives. status is None for a
+    readable entry, otherwise "skipped" or "failed" with a detail.
+
+    Archive members are read one at a time straight from the upload's
+    spooled file (TARs in streaming mode), never unpacked up front.
+    """
+
+    for upload in files:
+        filename = upload.filename or "upload"
+        lower = filename.lower()
+
+        try:
+            if lower.endswith(".zip"):
+                with zipfile.ZipFile(upload.file) as archive:
+                    for info in archive.infolist():
+                        if info.is_dir():
+                            continue
+                        name = f"{filename}/{info.filename}"
+                        reason = _check_entry(info.filename, info.file_size)
+                        if reason:
+                            yield name, None, "skipped", reason
+                            continue
+                        try:
+                            content = archive.read(info)
+                        except MEMBER_READ_ERRORS as e:
+                            yield name, None, "failed", f"Unreadable entry: {e}"
+                            continue
+                        yield name, content, None, None
+
+            elif lower.endswith(TAR_SUFFIXES):
+                with tarfile.open(fileobj=upload.file, mode="r|*") as archive:
+                    for member in archive:
+                        if not member.isfile():
+                            continue
+                        name = f"{filename}/{member.name}"
+                        reason = _check_entry(member.name, member.size)
+                        if reason:
+                            yield name, None, "skipped", reason
+                            continue
+                        try:
+                            content = archive.extractfile(member).read()
+                        except MEMBER_READ_ERRORS as e:
+                            # A broken stream usually ends the archive too,
+                            # which the handler below reports
+                            yield name, None, "failed", f"Unreadable entry: {e}"
+                            continue
+                        yield name, content, None, None
+
+            else:
+                content = upload.file.read(config.BULK_UPLOAD_MAX_ENTRY_BYTES + 1)
+                reason = _check_entry(filename, len(content))
+                if reason:
+                    yield filename, None, "skipped", reason
+                else:
+                    yield filename, content, None, None
+
+        except MEMBER_READ_ERRORS as e:
+            yield filename, None, "skipped", f"Unreadable archive: {e}"
+
+
+def _extract_chunks(name: str, content: bytes) -> List[str]:
+    text = extract_text(name, content)
+    if not text.strip():
+        return []
+    return chunk_text(text)
+
+
+def _bulk_index(project_id: str, files: List[UploadFile]) -> List[Dict]:
+    """
+    Extract entries in parallel (bounded workers and in-flight entries)
+    and stream their chunks into shared embedding / upsert batches.
+    """
+
+    # Results and upserted points are keyed per entry: the first entry
+    # with a given name keeps it, later ones become "name#2", "name#3", ...
+    results: Dict[str, Dict] = {}
+    name_counts: Dict[str, int] = {}
+    upserter = SharedBatchUpserter(project_id)
+    in_flight = deque()
+    max_in_flight = config.BULK_UPLOAD_WORKERS * 2
+
+    def _drain_one() -> None:
+        key, name, future = in_flight.popleft()
+        try:
+            chunks = future.result()
+        except Exception as e:
+            results[key] = {"filename": name, "status": "failed", "detail": str(e)}
+            return
+
+        if not chunks:
+            results[key] = {"filename": name, "status": "skipped", "detail": "No readable text found"}
+            return
+
+        results[key] = {"filename": name, "status": "indexed"}
+        upserter.add(key, chunks)
+
+    with ThreadPoolExecutor(max_workers=config.BULK_UPLOAD_WORKERS) as pool:
+        for name, content, status, detail in _iter_entries(files):
+            name_counts[name] = name_counts.get(name, 0) + 1
+            key = name if name_counts[name] == 1 else f"{name}#{name_counts[name]}"
+
+            if status:
+                results[key] = {"filename": name, "status": status, "detail": detail}
+                continue
+
+            in_flight.append((key, name, pool.submit(_extract_chunks, name, content)))
+            del content
+
+            while len(in_flight) >= max_in_flight:
+                _drain_one()
+
+        while in_flight:
+            _drain_one()
+
+    indexed = upserter.close()
+
+    for key, result in results.items():
+        if result["status"] != "indexed":
+            continue
+        result["chunks_indexed"] = indexed.get(key, 0)
+        if key in upserter.errors:
+            result["status"] = "failed"
+            result["detail"] = upserter.errors[key]
+
+    return list(results.values())
+
+
+@router.post("/upload/bulk")
+async def upload_bulk(
+    project_id: str = Form(...),
+    files: List[UploadFile] = File(...),
+    _: None = Depends(verify_internal_token)
+):
+    """
+    Index many files at once; ZIP and TAR archives are expanded.
+    Returns a result per file / archive member.
+    """
+
+    try:
+        results = await run_in_threadpool(_bulk_index, project_id, files)
+
+    except Exception as e:
+        print("BULK_UPLOAD_ERROR:", e)
+        raise HTTPException(500, f"Bulk upload failed: {str(e)}")
+
+    return {
+        "project_id": project_id,
+        "files": results,
+        "chunks_indexed": sum(r.get("chunks_indexed", 0) for r in results),
+    }
@@ -25,6 +25,21 @@ CRAWL_MAX_PAGES = int(
     os.getenv("CRAWL_MAX_PAGES", "20")
 )
 
+# Pages larger than this (decoded bytes) are aborted mid-download
+CRAWL_MAX_PAGE_BYTES = int(
+    os.getenv("CRAWL_MAX_PAGE_BYTES", str(5 * 1024 * 1024))
+)
+
+# Upper bound for /ingest with large_crawl=true
+CRAWL_LARGE_MAX_PAGES = int(
+    os.getenv("CRAWL_LARGE_MAX_PAGES", "50000")
+)
+
+# Expected URL count the large-crawl Bloom filter is sized for (1% FP)
+CRAWL_LARGE_BLOOM_CAPACITY = int(
+    os.getenv("CRAWL_LARGE_BLOOM_CAPACITY", "1000000")
+)
+
 CRAWL_USER_AGENT = os.getenv(
     "CRAWL_USER_AGENT",
     "ChattyDevsBot/1.0 (+https://chattydevs.com)",
@@ -61,6 +76,32 @@ QDRANT_UPSERT_BATCH_SIZE = int(
     os.getenv("QDRANT_UPSERT_BATCH_SIZE", "50")
 )
 
+# "shared": every project in QDRANT_COLLECTION_NAME (default)
+# "sharded": one custom shard key per project in QDRANT_SHARDED_COLLECTION_NAME,
+#            or a dedicated collection for QDRANT_DEDICATED_PROJECTS
+QDRANT_TENANCY_MODE = os.getenv("QDRANT_TENANCY_MODE", "shared").lower()
+
+QDRANT_SHARDED_COLLECTION_NAME = os.getenv(
+    "QDRANT_SHARDED_COLLECTION_NAME",
+    f"{QDRANT_COLLECTION_NAME}_sharded",
+)
+
+QDRANT_DEDICATED_PROJECTS = {
+    p.strip()
+    for p in os.getenv("QDRANT_DEDICATED_PROJECTS", "").split(",")
+    if p.strip()
+}
+
+QDRANT_DISTANCE = os.getenv("QDRANT_DISTANCE", "Cosine")
+
+
+# =========================
+# Vector store
+# =========================
+
+# "qdrant" (remote, default) or "local" (embedded, in-process)
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "qdrant").lower()
+
 
 # =========================
 # Gemini
@@ -93,7 +134,7 @@ missing = [name for name, val in zip(
         "GEMINI_API_KEY",
     ],
     REQUIRED_VARS
-) if not val]
+) if not val and (VECTOR_STORE_BACKEND == "qdrant" or not name.startswith("QDRANT_"))]
 
 # =========================
 # Safety / Performance
@@ -111,6 +152,136 @@ QDRANT_TIMEOUT_SECONDS = int(
     os.getenv("QDRANT_TIMEOUT_SECONDS", "30")
 )
 
+# =========================
+# HTTP / Startup
+# =========================
+
+HTTP_POOL_CONNECTIONS = int(
+    os.getenv("HTTP_POOL_CONNECTIONS", "10")
+)
+
+HTTP_POOL_MAXSIZE = int(
+    os.getenv("HTTP_POOL_MAXSIZE", "20")
+)
+
+# Preload tokenizer / parsers / HTTP stack at import (for pre-fork servers)
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() in ("1", "true", "yes")
+
+# =========================
+# Local storage
+# =========================
+
+DATA_DIR = os.getenv("DATA_DIR", "data")
+
+INGEST_CHECKPOINT_DIR = os.getenv(
+    "INGEST_CHECKPOINT_DIR",
+    os.path.join(DATA_DIR, "checkpoints"),
+)
+
+# Checkpoints older than this are discarded instead of resumed
+INGEST_CHECKPOINT_TTL_SECONDS = int(
+    os.getenv("INGEST_CHECKPOINT_TTL_SECONDS", str(7 * 24 * 3600))
+)
+
+PAGE_STORE_ENABLED = os.getenv("PAGE_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+PAGE_STORE_DIR = os.getenv(
+    "PAGE_STORE_DIR",
+    os.path.join(DATA_DIR, "pages"),
+)
+
+PAGE_STORE_MAX_BYTES = int(
+    os.getenv("PAGE_STORE_MAX_BYTES", str(512 * 1024 * 1024))
+)
+
+# 0 disables TTL expiry
+PAGE_STORE_TTL_SECONDS = int(
+    os.getenv("PAGE_STORE_TTL_SECONDS", str(7 * 24 * 3600))
+)
+
+LOCAL_VECTOR_STORE_DIR = os.getenv(
+    "LOCAL_VECTOR_STORE_DIR",
+    os.path.join(DATA_DIR, "vectors"),
+)
+
+# Keep chunk text in a local compressed store; vector payloads carry only its hash
+CONTENT_STORE_ENABLED = os.getenv("CONTENT_STORE_ENABLED", "false").lower() in ("1", "true", "yes")
+
+CONTENT_STORE_PATH = os.getenv(
+    "CONTENT_STORE_PATH",
+    os.path.join(DATA_DIR, "content.sqlite"),
+)
+
+# =========================
+# Bulk upload
+# =========================
+
+BULK_UPLOAD_WORKERS = int(
+    os.getenv("BULK_UPLOAD_WORKERS", "4")
+)
+
+BULK_UPLOAD_MAX_ENTRY_BYTES = int(
+    os.getenv("BULK_UPLOAD_MAX_ENTRY_BYTES", str(50 * 1024 * 1024))
+)
+
+# =========================
+# Scheduler (fair multi-tenant ingestion)
+# =========================
+
+SCHEDULER_WORKERS = int(
+    os.getenv("SCHEDULER_WORKERS", "4")
+)
+
+SCHEDULER_PROJECT_CONCURRENCY = int(
+    os.getenv("SCHEDULER_PROJECT_CONCURRENCY", "2")
+)
+
+# 0 disables the per-project token bucket
+SCHEDULER_PROJECT_TOKENS_PER_MINUTE = int(
+    os.getenv("SCHEDULER_PROJECT_TOKENS_PER_MINUTE", "0")
+)
+
+# "project_a:3,project_b:0.5" — projects not listed get weight 1
+SCHEDULER_PROJECT_WEIGHTS = {
+    name.strip(): float(weight)
+    for name, _, weight in (
+        item.partition(":")
+        for item in os.getenv("SCHEDULER_PROJECT_WEIGHTS", "").split(",")
+        if item.strip()
+    )
+}
+
+# =========================
+# Resilience (circuit breakers / hedging)
+# =========================
+
+BREAKER_FAILURE_THRESHOLD = int(
+    os.getenv("BREAKER_FAILURE_THRESHOLD", "5")
+)
+
+BREAKER_RESET_SECONDS = float(
+    os.getenv("BREAKER_RESET_SECONDS", "30")
+)
+
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Hedge once a call is slower than this latency percentile
+HEDGE_PERCENTILE = float(
+    os.getenv("HEDGE_PERCENTILE", "0.95")
+)
+
+HEDGE_MIN_DELAY_MS = int(
+    os.getenv("HEDGE_MIN_DELAY_MS", "50")
+)
+
+HEDGE_LATENCY_WINDOW = int(
+    os.getenv("HEDGE_LATENCY_WINDOW", "200")
+)
+
+HEDGE_MAX_WORKERS = int(
+    os.getenv("HEDGE_MAX_WORKERS", "32")
+)
+
 def validate_required():
     if missing:
         raise RuntimeError(
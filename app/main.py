@@ -1,10 +1,18 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from app.startup import mark_ready, timed, warmup
 
-import app.config as config
-from app.api.ingest import router as ingest_router
-from app.api.delete import router as delete_router
-from app.api.upload import router as upload_router
+with timed("import:fastapi"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+
+with timed("import:config"):
+    import app.config as config
+
+with timed("import:routers"):
+    from app.api.ingest import router as ingest_router
+    from app.api.delete import router as delete_router
+    from app.api.upload import router as upload_router
+    from app.api.rechunk import router as rechunk_router
+    from app.api.status import router as status_router
 
 # ==================================================
 # App initialization
@@ -18,6 +26,12 @@ app = FastAPI(
 )
 config.validate_required()
 
+# Optional: preload heavy state before workers are forked
+# (see gunicorn.conf.py); otherwise it loads lazily on first use.
+if config.STARTUP_WARMUP:
+    with timed("warmup"):
+        warmup()
+
 # ==================================================
 # Middleware
 # ==================================================
@@ -51,6 +65,18 @@ app.include_router(
     tags=["Upload"]
 )
 
+app.include_router(
+    rechunk_router,
+    prefix="/projects",
+    tags=["Ingestion"],
+)
+
+app.include_router(
+    status_router,
+    prefix="/status",
+    tags=["Status"],
+)
+
 # ==================================================
 # Health check
 # ==================================================
@@ -62,3 +88,10 @@ def health_check():
         "service": "chattydevs-core",
         "environment": config.APP_ENV,
     }
+
+# ==================================================
+# Startup report
+# ==================================================
+
+# Exposed at /status/startup
+mark_ready()
@@ -0,0 +1,134 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import app.config as config
+
+
+class IngestLockedError(RuntimeError):
+    """
+    Raised when another attempt of the same ingest is still running.
+    """
+
+
+def _project_dir(project_id: str) -> str:
+    # project_id is caller-supplied, never use it as a path component directly
+    digest = hashlib.sha256(project_id.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(config.INGEST_CHECKPOINT_DIR, digest)
+
+
+def _checkpoint_path(project_id: str, ingest_id: str) -> str:
+    return os.path.join(_project_dir(project_id), f"{ingest_id}.json")
+
+
+def checkpoint_work_dir(project_id: str, ingest_id: str) -> str:
+    """
+    Directory for bulky resumable state of an ingest (e.g. a disk frontier).
+    """
+    return os.path.join(_project_dir(project_id), f"{ingest_id}.work")
+
+
+@contextmanager
+def ingest_lock(project_id: str, ingest_id: str) -> Iterator[None]:
+    """
+    Exclusive, cross-process lock held for the whole run of an ingest.
+
+    A client that times out and retries while its first attempt is still
+    running must not share the checkpoint and work directory with it.
+    The lock is released by the kernel if the process dies.
+    """
+
+    path = os.path.join(_project_dir(project_id), f"{ingest_id}.lock")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    while True:
+        f = open(path, "a")
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            raise IngestLockedError(f"ingest {ingest_id} is already running")
+
+        try:
+            # The previous holder may have unlinked the file we opened
+            if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        f.close()
+
+    try:
+        yield
+    finally:
+        # Unlink while still holding the lock, so no one locks a stale file
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        f.close()
+
+
+def load_checkpoint(project_id: str, ingest_id: str) -> Optional[dict]:
+    """
+    Load the last saved checkpoint of an ingest, if any.
+    """
+
+    path = _checkpoint_path(project_id, ingest_id)
+
+    try:
+        age = time.time() - os.path.getmtime(path)
+        if age > config.INGEST_CHECKPOINT_TTL_SECONDS:
+            # Too old to trust (site / index may have changed since)
+            clear_checkpoint(project_id, ingest_id)
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        # Corrupt / unreadable checkpoint: start over rather than fail
+        return None
+
+
+def save_checkpoint(project_id: str, ingest_id: str, data: dict) -> None:
+    """
+    Durably write a checkpoint (write to temp file, fsync, atomic rename).
+    """
+
+    path = _checkpoint_path(project_id, ingest_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(project_id: str, ingest_id: str) -> None:
+    """
+    Remove the checkpoint (and work directory) of a completed ingest.
+    """
+
+    try:
+        os.remove(_checkpoint_path(project_id, ingest_id))
+    except FileNotFoundError:
+        pass
+
+    shutil.rmtree(checkpoint_work_dir(project_id, ingest_id), ignore_errors=True)
+
+
+def delete_project_checkpoints(project_id: str) -> None:
+    """
+    Remove every checkpoint of a project (used when the project is deleted).
+    """
+
+    shutil.rmtree(_project_dir(project_id), ignore_errors=True)
@@ -1,11 +1,27 @@
-import tiktoken
+from functools import lru_cache
 from typing import List
 
 import app.config as config
 
 
-# Initialize tokenizer once (global, reused)
-_encoder = tiktoken.get_encoding(config.TOKEN_ENCODING)
+@lru_cache(maxsize=1)
+def get_encoder():
+    """
+    Tokenizer, loaded on first use (global, reused).
+
+    tiktoken may read or download BPE files here, so it is kept off the
+    import path; app.startup.warmup() can load it ahead of a pre-fork.
+    """
+    import tiktoken
+
+    return tiktoken.get_encoding(config.TOKEN_ENCODING)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Number of tokens in text under the configured encoding.
+    """
+    return len(get_encoder().encode(text))
 
 
 def chunk_text(
@@ -27,6 +43,7 @@ def chunk_text(
         return []
 
     token_limit = max_tokens or config.CHUNK_TOKEN_SIZE
+    _encoder = get_encoder()
     if len(text) > 500_000:
         text = text[:500_000]
 
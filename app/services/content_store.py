@@ -0,0 +1,188 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Collection, Dict, Iterable, List, Tuple
+
+import app.config as config
+
+
+# ================== CONSTANTS ==================
+
+# SQLite caps bound parameters per statement; stay well below it
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS points (
+    point_id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    url TEXT,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS points_project_url ON points (project_id, url);
+CREATE INDEX IF NOT EXISTS points_hash ON points (hash);
+"""
+
+_local = threading.local()
+
+# ===============================================
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _connect() -> sqlite3.Connection:
+    # One connection per thread (scheduler workers write concurrently)
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        path = config.CONTENT_STORE_PATH
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _batches(items: List[str]) -> Iterable[List[str]]:
+    for i in range(0, len(items), _LOOKUP_BATCH):
+        yield items[i : i + _LOOKUP_BATCH]
+
+
+# ================== WRITE ==================
+
+def put_many(
+    project_id: str,
+    items: Iterable[Tuple[str, str, str]],
+) -> Dict[str, str]:
+    """
+    Store chunk texts, content-addressed, and map point IDs to them.
+
+    Args:
+        items: (point_id, url, text) triples
+
+    Returns:
+        Dict[str, str]: point_id -> content hash
+    """
+
+    blobs = {}
+    rows = []
+    hashes: Dict[str, str] = {}
+
+    for point_id, url, text in items:
+        digest = content_hash(text)
+        if digest not in blobs:
+            blobs[digest] = zlib.compress(text.encode("utf-8"), 6)
+        rows.append((str(point_id), project_id, url, digest))
+        hashes[str(point_id)] = digest
+
+    conn = _connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO blobs (hash, data) VALUES (?, ?)",
+            blobs.items(),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO points (point_id, project_id, url, hash) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    return hashes
+
+
+# ================== READ ==================
+
+def get_many(point_ids: Collection[str]) -> Dict[str, str]:
+    """
+    Bulk lookup of chunk text by point ID (missing IDs are omitted).
+    """
+
+    conn = _connect()
+    found: Dict[str, str] = {}
+
+    for batch in _batches([str(p) for p in point_ids]):
+        rows = conn.execute(
+            "SELECT points.point_id, blobs.data FROM points"
+            " JOIN blobs ON blobs.hash = points.hash"
+            f" WHERE points.point_id IN ({','.join('?' * len(batch))})",
+            batch,
+        )
+        for point_id, data in rows:
+            found[point_id] = zlib.decompress(data).decode("utf-8")
+
+    return found
+
+
+def attach_content(hits: List[Dict]) -> List[Dict]:
+    """
+    Fill payload["content"] of search hits whose text lives in the store.
+    """
+
+    missing = [h["id"] for h in hits if "content" not in h["payload"]]
+    if not missing:
+        return hits
+
+    texts = get_many(missing)
+    for h in hits:
+        text = texts.get(str(h["id"]))
+        if text is not None:
+            h["payload"]["content"] = text
+
+    return hits
+
+
+# ================== DELETE ==================
+
+def _collect_garbage(conn: sqlite3.Connection, hashes: Collection[str]) -> None:
+    # Only the hashes whose points were just removed can have become orphans
+    for batch in _batches(list(set(hashes))):
+        conn.execute(
+            f"DELETE FROM blobs WHERE hash IN ({','.join('?' * len(batch))})"
+            " AND NOT EXISTS (SELECT 1 FROM points WHERE points.hash = blobs.hash)",
+            batch,
+        )
+
+
+def delete_project(project_id: str) -> None:
+    """
+    Forget every point of a project and drop content no longer referenced.
+    """
+
+    conn = _connect()
+    with conn:
+        hashes = [
+            h for (h,) in conn.execute(
+                "SELECT DISTINCT hash FROM points WHERE project_id = ?", (project_id,)
+            )
+        ]
+        conn.execute("DELETE FROM points WHERE project_id = ?", (project_id,))
+        _collect_garbage(conn, hashes)
+
+
+def delete_url(project_id: str, url: str, keep_ids: Collection[str] = ()) -> None:
+    """
+    Forget the points of one url, except keep_ids.
+    """
+
+    keep = {str(p) for p in keep_ids}
+
+    conn = _connect()
+    with conn:
+        doomed = [
+            (point_id, digest)
+            for point_id, digest in conn.execute(
+                "SELECT point_id, hash FROM points WHERE project_id = ? AND url = ?",
+                (project_id, url),
+            )
+            if point_id not in keep
+        ]
+        conn.executemany("DELETE FROM points WHERE point_id = ?", [(p,) for p, _ in doomed])
+        _collect_garbage(conn, [digest for _, digest in doomed])
@@ -1,32 +1,186 @@
 import requests
-from bs4 import BeautifulSoup
+import threading
+from collections import deque
+from dataclasses import dataclass, field
 from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Set
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
 
 import app.config as config
+from app.services.frontier import LargeCrawlState, normalize_url
+from app.services.http import get_session
+from app.services.page_store import put_page
 
 
-def crawl_site(
+@dataclass
+class CrawlState:
+    """
+    Resumable crawl position: pending frontier and already-fetched URLs,
+    kept in memory (see LargeCrawlState for the disk-backed variant).
+    """
+
+    queue: Deque[Tuple[str, int]]
+    visited: Set[str] = field(default_factory=set)
+    # Every URL ever queued, so the frontier holds each URL once
+    # (derived from queue + visited, not saved)
+    enqueued: Set[str] = field(init=False, repr=False)
+
+    mode = "memory"
+
+    def __post_init__(self) -> None:
+        self.enqueued = set(self.visited)
+        self.enqueued.update(url for url, _ in self.queue)
+
+    @classmethod
+    def start(cls, start_url: str) -> "CrawlState":
+        return cls(queue=deque([(start_url, 0)]))
+
+    def push(self, url: str, depth: int) -> None:
+        if url not in self.enqueued:
+            self.enqueued.add(url)
+            self.queue.append((url, depth))
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        return self.queue.popleft() if self.queue else None
+
+    def is_visited(self, url: str) -> bool:
+        return url in self.visited
+
+    def mark_visited(self, url: str) -> None:
+        self.visited.add(url)
+
+    @property
+    def visited_count(self) -> int:
+        return len(self.visited)
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "queue": [list(item) for item in self.queue],
+            "visited": sorted(self.visited),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CrawlState":
+        return cls(
+            queue=deque(
+                (item, 0) if isinstance(item, str) else tuple(item)
+                for item in data.get("queue", [])
+            ),
+            visited=set(data.get("visited", [])),
+        )
+
+
+# ================== FETCH STATS ==================
+
+_stats_lock = threading.Lock()
+_stats = {
+    "pages_fetched": 0,
+    "bytes_downloaded": 0,
+    "bytes_discarded": 0,
+    "rejected_content_type": 0,
+    "rejected_too_large": 0,
+}
+
+
+def _count(**deltas: int) -> None:
+    with _stats_lock:
+        for key, delta in deltas.items():
+            _stats[key] += delta
+
+
+def fetch_stats() -> Dict[str, int]:
+    """
+    Process-wide crawl transfer counters (bytes are on-the-wire bytes).
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _fetch_html(url: str, headers: dict) -> Optional[Tuple[bytes, Optional[str]]]:
+    """
+    Stream a page, rejecting non-HTML from the headers alone and aborting
+    once CRAWL_MAX_PAGE_BYTES (decoded) is exceeded.
+
+    Returns:
+        (body, charset) or None if the page was rejected
+    """
+
+    cap = config.CRAWL_MAX_PAGE_BYTES
+
+    with get_session().get(
+        url,
+        headers=headers,
+        timeout=config.CRAWL_TIMEOUT,
+        stream=True,
+    ) as response:
+        content_type = response.headers.get("Content-Type", "")
+        if "text/html" not in content_type:
+            _count(rejected_content_type=1)
+            return None
+
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > cap:
+            _count(rejected_too_large=1)
+            return None
+
+        body = bytearray()
+        for block in response.iter_content(chunk_size=64 * 1024):
+            body += block
+            if len(body) > cap:
+                wire = response.raw.tell()
+                _count(rejected_too_large=1, bytes_downloaded=wire, bytes_discarded=wire)
+                return None
+
+        _count(pages_fetched=1, bytes_downloaded=response.raw.tell())
+
+        charset = None
+        if "charset=" in content_type.lower():
+            charset = response.encoding
+
+        return bytes(body), charset
+
+
+def crawl_state_from_dict(data: dict):
+    """
+    Restore a CrawlState / LargeCrawlState saved with to_dict().
+    """
+
+    if data.get("mode") == LargeCrawlState.mode:
+        return LargeCrawlState.from_dict(data)
+    return CrawlState.from_dict(data)
+
+
+def iter_site(
     start_url: str,
     max_pages: int | None = None,
-) -> List[Dict[str, str]]:
+    state: CrawlState | LargeCrawlState | None = None,
+    cache_project_id: str | None = None,
+    max_depth: int | None = None,
+    path_prefix: str | None = None,
+) -> Iterator[Dict[str, str]]:
     """
-    Crawl a website starting from start_url and extract readable text.
+    Crawl a website and yield pages as they are fetched.
 
-    Args:
-        start_url (str): Entry URL
-        max_pages (int | None): Override max pages limit
+    state is updated in place before each page is yielded, so a snapshot
+    taken at that point resumes the crawl right after the yielded page.
 
-    Returns:
-        List[Dict[str, str]]: [{ "url": str, "text": str }]
+    Links deeper than max_depth hops from the start page, or whose path
+    does not start with path_prefix, are not followed.
+
+    When cache_project_id is set, every yielded page (raw HTML + text)
+    is also written to the local page store under that project.
+
+    Yields:
+        Dict[str, str]: { "url": str, "text": str }
     """
 
     if not start_url:
-        return []
+        return
+
+    from bs4 import BeautifulSoup
 
-    visited: Set[str] = set()
-    queue: List[str] = [start_url]
-    pages: List[Dict[str, str]] = []
+    if state is None:
+        state = CrawlState.start(start_url)
 
     parsed_start = urlparse(start_url)
     domain = parsed_start.netloc
@@ -34,33 +188,36 @@ def crawl_site(
     page_limit = max_pages or config.CRAWL_MAX_PAGES
 
     headers = {
-        "User-Agent": config.CRAWL_USER_AGENT
+        "User-Agent": config.CRAWL_USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Encoding": "gzip, deflate",
     }
 
-    while queue and len(visited) < page_limit:
-        url = queue.pop(0)
-        url = url.split("#")[0].rstrip("/")
+    while state.visited_count < page_limit:
+        item = state.pop()
+        if item is None:
+            break
 
-        if url in visited:
+        url, depth = item
+        url = normalize_url(url)
+
+        if state.is_visited(url):
             continue
 
         try:
-            response = requests.get(
-                url,
-                headers=headers,
-                timeout=config.CRAWL_TIMEOUT,
-            )
-
-            content_type = response.headers.get("Content-Type", "")
-            if "text/html" not in content_type:
-                continue
-
+            fetched = _fetch_html(url, headers)
         except requests.RequestException:
             continue
 
-        visited.add(url)
+        if fetched is None:
+            continue
+
+        body, charset = fetched
+        state.mark_visited(url)
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(body, "html.parser", from_encoding=charset)
+        html = body.decode(soup.original_encoding or "utf-8", errors="replace")
+        del body
 
         # Extract readable paragraph text
         text = " ".join(
@@ -70,22 +227,48 @@ def crawl_site(
         if len(text) > 200_000:
             text = text[:200_000]
 
+        # Discover internal links
+        if max_depth is None or depth < max_depth:
+            for a in soup.find_all("a", href=True):
+                link = urljoin(url, a["href"])
+                parsed_link = urlparse(link)
+
+                if (
+                    parsed_link.scheme in ("http", "https")
+                    and parsed_link.netloc == domain
+                    and (not path_prefix or parsed_link.path.startswith(path_prefix))
+                ):
+                    state.push(normalize_url(link), depth + 1)
+
+        soup.decompose()
+
         if text:
-            pages.append({
+            if cache_project_id and config.PAGE_STORE_ENABLED:
+                # The cache is best-effort; a full disk must not fail the crawl
+                try:
+                    put_page(cache_project_id, url, html, text)
+                except OSError as e:
+                    print("PAGE_STORE_ERROR:", e)
+
+            yield {
                 "url": url,
                 "text": text,
-            })
+            }
 
-        # Discover internal links
-        for a in soup.find_all("a", href=True):
-            link = urljoin(url, a["href"])
-            parsed_link = urlparse(link)
-
-            if (
-                parsed_link.scheme in ("http", "https")
-                and parsed_link.netloc == domain
-                and link not in visited
-            ):
-                queue.append(link)
-
-    return pages
+
+def crawl_site(
+    start_url: str,
+    max_pages: int | None = None,
+) -> List[Dict[str, str]]:
+    """
+    Crawl a website starting from start_url and extract readable text.
+
+    Args:
+        start_url (str): Entry URL
+        max_pages (int | None): Override max pages limit
+
+    Returns:
+        List[Dict[str, str]]: [{ "url": str, "text": str }]
+    """
+
+    return list(iter_site(start_url, max_pages))
@@ -1,79 +1,8 @@
-import requests
-import time
-from typing import List, Optional
+from typing import Collection
 
 import app.config as config
-
-
-# ================== CONSTANTS ==================
-
-QDRANT_HEADERS = {
-    "Content-Type": "application/json",
-    "api-key": config.QDRANT_API_KEY,
-}
-
-# ===============================================
-
-
-def _post_with_retry(url, headers, json, timeout):
-    for attempt in range(3):
-        try:
-            res = requests.post(url, headers=headers, json=json, timeout=timeout)
-            res.raise_for_status()
-            return res
-        except Exception:
-            if attempt == 2:
-                raise
-            time.sleep(1.5)
-
-
-def _scroll_project_points(project_id: str) -> List[str]:
-    """
-    Fetch all Qdrant point IDs for a given project_id using scroll API.
-    Cloud-Qdrant safe.
-    """
-
-    point_ids: List[str] = []
-    offset: Optional[str] = None
-
-    while True:
-        payload = {
-            "limit": config.QDRANT_SCROLL_LIMIT,
-            "with_payload": False,
-            "filter": {
-                "must": [
-                    {
-                        "key": "project_id",
-                        "match": {"value": project_id},
-                    }
-                ]
-            },
-        }
-
-        if offset:
-            payload["offset"] = offset
-
-        response = _post_with_retry(
-            url=f"{config.QDRANT_URL}/collections/{config.QDRANT_COLLECTION_NAME}/points/scroll",
-            headers=QDRANT_HEADERS,
-            json=payload,
-            timeout=15,
-        )
-
-        result = response.json().get("result", {})
-        points = result.get("points", [])
-
-        if not points:
-            break
-
-        for p in points:
-            point_ids.append(p["id"])
-
-        offset = result.get("next_page_offset")
-        if not offset:
-            break
-
-    return point_ids
+from app.services import content_store
+from app.services.vector_store import get_vector_store
 
 
 def delete_project_vectors(project_id: str) -> int:
@@ -87,16 +16,30 @@ def delete_project_vectors(project_id: str) -> int:
     if not project_id:
         raise ValueError("project_id is required")
 
-    point_ids = _scroll_project_points(project_id)
+    deleted = get_vector_store().delete_project(project_id)
+
+    if config.CONTENT_STORE_ENABLED:
+        content_store.delete_project(project_id)
+
+    return deleted
+
+
+def delete_url_vectors(
+    project_id: str,
+    url: str,
+    keep_ids: Collection[str] = (),
+) -> None:
+    """
+    Delete the vectors of one url within a project, except keep_ids.
+
+    Used after re-indexing a page: the fresh points are upserted first,
+    then every stale point of that url is removed.
+    """
 
-    if not point_ids:
-        return 0
+    if not project_id or not url:
+        raise ValueError("project_id and url are required")
 
-    _post_with_retry(
-        url=f"{config.QDRANT_URL}/collections/{config.QDRANT_COLLECTION_NAME}/points/delete",
-        headers=QDRANT_HEADERS,
-        json={"points": point_ids},
-        timeout=15,
-    )
+    get_vector_store().delete(project_id, url=url, keep_ids=keep_ids)
 
-    return len(point_ids)
+    if config.CONTENT_STORE_ENABLED:
+        content_store.delete_url(project_id, url, keep_ids)
@@ -1,17 +1,19 @@
 import uuid
-import requests
-from typing import List
+from collections import deque
+from concurrent.futures import wait
+from typing import Callable, Collection, Dict, List, Optional, Tuple
 
 import app.config as config
+from app.services import content_store
+from app.services.chunk import count_tokens
+from app.services.http import get_session
+from app.services.resilience import CircuitOpenError, get_backend
+from app.services.scheduler import PRIORITY_BULK, get_scheduler
+from app.services.vector_store import get_vector_store
 
 
 # ================== CONSTANTS ==================
 
-QDRANT_HEADERS = {
-    "Content-Type": "application/json",
-    "api-key": config.QDRANT_API_KEY,
-}
-
 GEMINI_EMBED_ENDPOINT = (
     f"https://generativelanguage.googleapis.com/v1beta/"
     f"{config.GEMINI_EMBED_MODEL}:embedContent"
@@ -22,23 +24,42 @@ GEMINI_EMBED_ENDPOINT = (
 
 import time
 
+
+def point_id(project_id: str, url: str, chunk: str) -> str:
+    """
+    Deterministic point ID, so re-upserting the same chunk overwrites
+    the existing point instead of creating a duplicate.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project_id}\n{url}\n{chunk}"))
+
+
+def _embed_once(text: str) -> List[float]:
+    response = get_session("gemini").post(
+        GEMINI_EMBED_ENDPOINT,
+        params={"key": config.GEMINI_API_KEY},
+        headers={"Content-Type": "application/json"},
+        json={
+            "content": {
+                "parts": [{"text": text}]
+            }
+        },
+        timeout=20,
+    )
+
+    response.raise_for_status()
+    return response.json()["embedding"]["values"]
+
+
 def embed_text(text: str) -> List[float]:
+    gemini = get_backend("gemini")
+
     for attempt in range(3):
         try:
-            response = requests.post(
-                GEMINI_EMBED_ENDPOINT,
-                params={"key": config.GEMINI_API_KEY},
-                headers={"Content-Type": "application/json"},
-                json={
-                    "content": {
-                        "parts": [{"text": text}]
-                    }
-                },
-                timeout=20,
-            )
+            # Embedding is idempotent, so slow calls may be hedged
+            return gemini.call(_embed_once, text, idempotent=True)
 
-            response.raise_for_status()
-            return response.json()["embedding"]["values"]
+        except CircuitOpenError:
+            raise
 
         except Exception:
             if attempt == 2:
@@ -48,69 +69,199 @@ def embed_text(text: str) -> List[float]:
 
 def _build_points(
     project_id: str,
-    url: str,
-    chunks: List[str],
+    items: List[Tuple[str, str]],
 ):
     """
-    Generator that converts text chunks into Qdrant-ready points.
+    Generator that converts (url, chunk) pairs into vector-store points.
+
+    With CONTENT_STORE_ENABLED the chunk text is written to the local
+    content store and the payload only carries its hash.
     """
-    for chunk in chunks:
+    for url, chunk in items:
         embedding = embed_text(chunk)
 
+        payload = {
+            "project_id": project_id,
+            "url": url,
+        }
+        if config.CONTENT_STORE_ENABLED:
+            payload["content_hash"] = content_store.content_hash(chunk)
+        else:
+            payload["content"] = chunk
+
         yield {
-            "id": str(uuid.uuid4()),
+            "id": point_id(project_id, url, chunk),
             "vector": embedding,
-            "payload": {
-                "project_id": project_id,
-                "url": url,
-                "content": chunk,
-            },
+            "payload": payload,
         }
 
 
+def _embed_and_upsert_batch(
+    project_id: str,
+    items: List[Tuple[str, str]],
+    on_done: Optional[Callable[[], None]] = None,
+) -> int:
+    """
+    Embed one batch of (url, chunk) pairs and upsert it in a single request.
+    """
+
+    points = list(_build_points(project_id, items))
+
+    if config.CONTENT_STORE_ENABLED:
+        # Content first: a point must never reference text that is not stored
+        content_store.put_many(
+            project_id,
+            [(p["id"], url, chunk) for p, (url, chunk) in zip(points, items)],
+        )
+
+    _upsert_batch(project_id, points)
+
+    if on_done is not None:
+        on_done()
+
+    return len(points)
+
+
 def upsert_chunks(
     project_id: str,
     url: str,
     chunks: List[str],
+    priority: int = PRIORITY_BULK,
+    done_batches: Collection[int] = (),
+    on_batch: Optional[Callable[[int], None]] = None,
 ) -> int:
     """
-    Embed and upsert chunks into Qdrant.
+    Embed and upsert chunks into the vector store.
+
+    Each batch is queued on the fair scheduler under project_id, so large
+    ingests share workers and embedding quota with other projects.
+
+    Batches are identified by the index of their first chunk. Batches in
+    done_batches are skipped; on_batch is called with the index of every
+    batch once it has been upserted.
 
     Returns:
-        int: number of vectors inserted
+        int: number of vectors inserted (skipped batches not included)
     """
 
     if not project_id or not url or not chunks:
         raise ValueError("project_id, url and chunks are required")
 
-    inserted = 0
-    batch: List[dict] = []
-
-    for point in _build_points(project_id, url, chunks):
-        batch.append(point)
+    scheduler = get_scheduler()
+    batch_size = config.QDRANT_UPSERT_BATCH_SIZE
 
-        if len(batch) >= config.QDRANT_UPSERT_BATCH_SIZE:
-            _upsert_batch(batch)
-            inserted += len(batch)
-            batch.clear()
+    futures = []
+    for i in range(0, len(chunks), batch_size):
+        if i in done_batches:
+            continue
 
-    if batch:
-        _upsert_batch(batch)
-        inserted += len(batch)
+        batch = chunks[i : i + batch_size]
+        futures.append(
+            scheduler.submit(
+                project_id,
+                sum(count_tokens(c) for c in batch),
+                _embed_and_upsert_batch,
+                project_id,
+                [(url, c) for c in batch],
+                on_done=(lambda i=i: on_batch(i)) if on_batch else None,
+                priority=priority,
+            )
+        )
 
-    return inserted
+    try:
+        return sum(f.result() for f in futures)
+    except Exception:
+        # Never return while batches still run: their on_batch would write
+        # progress into state the caller is about to close
+        for f in futures:
+            f.cancel()
+        wait(futures)
+        raise
 
 
-def _upsert_batch(points: List[dict]) -> None:
+class SharedBatchUpserter:
     """
-    Perform a batch upsert to Qdrant.
+    Packs chunks from many documents into shared embedding / upsert
+    batches, so small files don't each pay for a partial batch.
+
+    At most max_pending batches are queued at once; add() blocks on the
+    oldest one beyond that, which keeps memory bounded.
     """
 
-    response = requests.put(
-        f"{config.QDRANT_URL}/collections/{config.QDRANT_COLLECTION_NAME}/points",
-        headers=QDRANT_HEADERS,
-        json={"points": points},
-        timeout=30,
-    )
+    def __init__(
+        self,
+        project_id: str,
+        priority: int = PRIORITY_BULK,
+        max_pending: int | None = None,
+    ):
+        if not project_id:
+            raise ValueError("project_id is required")
 
-    response.raise_for_status()
+        self.project_id = project_id
+        self.priority = priority
+        self.max_pending = max_pending or config.SCHEDULER_WORKERS * 2
+
+        self.indexed: Dict[str, int] = {}
+        self.errors: Dict[str, str] = {}
+
+        self._items: List[Tuple[str, str]] = []
+        self._pending = deque()
+
+    def add(self, url: str, chunks: List[str]) -> None:
+        self.indexed.setdefault(url, 0)
+
+        for chunk in chunks:
+            self._items.append((url, chunk))
+            if len(self._items) >= config.QDRANT_UPSERT_BATCH_SIZE:
+                self._submit()
+
+    def close(self) -> Dict[str, int]:
+        """
+        Flush the last partial batch and wait for everything queued.
+
+        Returns:
+            Dict[str, int]: vectors inserted per url (see .errors for failures)
+        """
+
+        if self._items:
+            self._submit()
+        while self._pending:
+            self._collect()
+        return self.indexed
+
+    def _submit(self) -> None:
+        items, self._items = self._items, []
+
+        future = get_scheduler().submit(
+            self.project_id,
+            sum(count_tokens(c) for _, c in items),
+            _embed_and_upsert_batch,
+            self.project_id,
+            items,
+            priority=self.priority,
+        )
+        self._pending.append((future, items))
+
+        while len(self._pending) > self.max_pending:
+            self._collect()
+
+    def _collect(self) -> None:
+        future, items = self._pending.popleft()
+
+        try:
+            future.result()
+        except Exception as e:
+            for url, _ in items:
+                self.errors.setdefault(url, str(e))
+            return
+
+        for url, _ in items:
+            self.indexed[url] += 1
+
+
+def _upsert_batch(project_id: str, points: List[dict]) -> None:
+    """
+    Perform a batch upsert to the configured vector store.
+    """
+
+    get_vector_store().upsert(project_id, points)
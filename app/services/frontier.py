@@ -0,0 +1,158 @@
+import hashlib
+import math
+import os
+import shutil
+import sqlite3
+from typing import Optional, Tuple
+
+import app.config as config
+
+
+def normalize_url(url: str) -> str:
+    """
+    Crawl-frontier form of a URL: no fragment, no trailing slash.
+    """
+    return url.split("#")[0].rstrip("/")
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings (no false negatives).
+    Memory: ~1.2 bytes per expected item at a 1% false-positive rate.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class LargeCrawlState:
+    """
+    Disk-backed crawl position for large sites; memory stays flat as the
+    page count grows.
+
+      frontier.log  append-only "depth<TAB>url" lines, consumed from an offset
+      seen.sqlite   every URL ever enqueued (exact set)
+      BloomFilter   in-memory front for the seen set, so most new links
+                    never touch SQLite
+
+    URLs are de-duplicated when enqueued, so the frontier holds each URL
+    at most once. to_dict() flushes both files; together with the saved
+    offset that makes the state resumable after a crash.
+    """
+
+    mode = "large"
+
+    def __init__(
+        self,
+        work_dir: str,
+        read_offset: int = 0,
+        visited_count: int = 0,
+    ):
+        self.work_dir = work_dir
+        self.read_offset = read_offset
+        self.visited_count = visited_count
+
+        os.makedirs(work_dir, exist_ok=True)
+
+        self._frontier_path = os.path.join(work_dir, "frontier.log")
+        self._writer = open(self._frontier_path, "ab")
+        self._reader = open(self._frontier_path, "rb")
+
+        self._db = sqlite3.connect(os.path.join(work_dir, "seen.sqlite"), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY)")
+
+        self._bloom = BloomFilter(config.CRAWL_LARGE_BLOOM_CAPACITY)
+        for (url,) in self._db.execute("SELECT url FROM seen"):
+            self._bloom.add(url)
+
+    @classmethod
+    def start(cls, work_dir: str, start_url: str) -> "LargeCrawlState":
+        # A fresh crawl never reuses leftovers of an earlier one
+        shutil.rmtree(work_dir, ignore_errors=True)
+        state = cls(work_dir)
+        state.push(normalize_url(start_url), 0)
+        return state
+
+    # ---------- frontier ----------
+
+    def push(self, url: str, depth: int) -> None:
+        if self._is_seen(url):
+            return
+
+        self._db.execute("INSERT OR IGNORE INTO seen (url) VALUES (?)", (url,))
+        self._bloom.add(url)
+        self._writer.write(f"{depth}\t{url}\n".encode("utf-8"))
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        self._writer.flush()
+
+        self._reader.seek(self.read_offset)
+        line = self._reader.readline()
+        if not line.endswith(b"\n"):
+            return None
+
+        self.read_offset += len(line)
+        depth, _, url = line.decode("utf-8").rstrip("\n").partition("\t")
+        return url, int(depth)
+
+    # ---------- visited ----------
+
+    def _is_seen(self, url: str) -> bool:
+        if url not in self._bloom:
+            return False
+        return self._db.execute("SELECT 1 FROM seen WHERE url = ?", (url,)).fetchone() is not None
+
+    def is_visited(self, url: str) -> bool:
+        # Every popped URL was enqueued exactly once, so it is always new
+        return False
+
+    def mark_visited(self, url: str) -> None:
+        self.visited_count += 1
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> dict:
+        # Frontier lines first, then the seen set: a crash in between can
+        # only re-enqueue a URL, never lose one
+        self._writer.flush()
+        os.fsync(self._writer.fileno())
+        self._db.commit()
+
+        return {
+            "mode": self.mode,
+            "work_dir": self.work_dir,
+            "read_offset": self.read_offset,
+            "visited_count": self.visited_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LargeCrawlState":
+        return cls(
+            work_dir=data["work_dir"],
+            read_offset=data.get("read_offset", 0),
+            visited_count=data.get("visited_count", 0),
+        )
+
+    def close(self, remove: bool = False) -> None:
+        self._writer.close()
+        self._reader.close()
+        self._db.close()
+        if remove:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
@@ -0,0 +1,41 @@
+import os
+import threading
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import app.config as config
+
+
+# ================== SESSIONS ==================
+
+# Keyed by (pid, name): connection pools must never be shared across a
+# fork, so a worker forked from a warmed-up master builds its own pools.
+_sessions: Dict[Tuple[int, str], requests.Session] = {}
+_lock = threading.Lock()
+
+
+def get_session(name: str = "default") -> requests.Session:
+    """
+    Process-local pooled requests.Session, reused across calls so that
+    keep-alive connections (and TLS handshakes) are shared.
+    """
+
+    key = (os.getpid(), name)
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=config.HTTP_POOL_MAXSIZE,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return session
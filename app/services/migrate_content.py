@@ -0,0 +1,68 @@
+"""
+Move chunk text of existing points from payload.content into the local
+content store (CONTENT_STORE_ENABLED=true).
+
+    python -m app.services.migrate_content <project_id> [<project_id> ...]
+
+Text is written to the content store before the payload is slimmed, so
+an interrupted run can simply be started again; points that already
+carry a content_hash are skipped.
+"""
+
+import argparse
+from typing import Dict, List, Optional
+
+import app.config as config
+from app.services import content_store
+from app.services.vector_store import get_vector_store
+
+
+def migrate_project(project_id: str) -> int:
+    """
+    Store the text of every point still holding payload.content and
+    replace it with its content_hash.
+
+    Returns:
+        int: number of points migrated
+    """
+
+    if not config.CONTENT_STORE_ENABLED:
+        raise ValueError("Set CONTENT_STORE_ENABLED=true before migrating")
+
+    store = get_vector_store()
+    migrated = 0
+
+    for points in store.iter_payloads(project_id, config.QDRANT_UPSERT_BATCH_SIZE):
+        pending = [p for p in points if "content" in p["payload"]]
+        if not pending:
+            continue
+
+        hashes = content_store.put_many(
+            project_id,
+            [(p["id"], p["payload"].get("url"), p["payload"]["content"]) for p in pending],
+        )
+
+        slim: Dict[str, dict] = {}
+        for p in pending:
+            payload = {k: v for k, v in p["payload"].items() if k != "content"}
+            payload["content_hash"] = hashes[str(p["id"])]
+            slim[p["id"]] = payload
+
+        store.replace_payloads(project_id, slim)
+        migrated += len(slim)
+
+    return migrated
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("project_ids", nargs="+")
+    args = parser.parse_args(argv)
+
+    for project_id in args.project_ids:
+        migrated = migrate_project(project_id)
+        print(f"MIGRATED: {project_id} ({migrated} points)")
+
+
+if __name__ == "__main__":
+    main()
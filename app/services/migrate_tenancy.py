@@ -0,0 +1,139 @@
+"""
+Move existing points out of the shared collection into per-project
+shard keys / dedicated collections (QDRANT_TENANCY_MODE=sharded).
+
+    python -m app.services.migrate_tenancy <project_id> [<project_id> ...]
+    python -m app.services.migrate_tenancy --all
+
+Points are copied first and removed from the shared collection only
+after every batch was acknowledged, so an interrupted run can simply be
+started again (point IDs are preserved, re-copies overwrite).
+"""
+
+import argparse
+from typing import Iterator, List, Optional, Set
+
+import app.config as config
+from app.services.tenancy import Route, ensure_route, request_with_retry, route_for
+
+
+def _shared_route() -> Route:
+    return Route(collection=config.QDRANT_COLLECTION_NAME)
+
+
+def _project_filter(project_id: str) -> dict:
+    return {
+        "must": [
+            {"key": "project_id", "match": {"value": project_id}},
+        ]
+    }
+
+
+def _scroll(payload: dict) -> Iterator[List[dict]]:
+    source = _shared_route()
+    offset: Optional[str] = None
+
+    while True:
+        body = dict(payload)
+        if offset:
+            body["offset"] = offset
+
+        response = request_with_retry(
+            "POST",
+            f"{source.base_url}/points/scroll",
+            json=body,
+            timeout=config.QDRANT_TIMEOUT_SECONDS,
+        )
+
+        result = response.json().get("result", {})
+        points = result.get("points", [])
+        if not points:
+            break
+
+        yield points
+
+        offset = result.get("next_page_offset")
+        if not offset:
+            break
+
+
+def list_shared_projects() -> Set[str]:
+    """
+    Every project_id that still has points in the shared collection.
+    """
+
+    projects: Set[str] = set()
+    for points in _scroll({
+        "limit": config.QDRANT_SCROLL_LIMIT,
+        "with_payload": {"include": ["project_id"]},
+        "with_vector": False,
+    }):
+        for p in points:
+            project_id = (p.get("payload") or {}).get("project_id")
+            if project_id:
+                projects.add(project_id)
+    return projects
+
+
+def migrate_project(project_id: str) -> int:
+    """
+    Copy a project's points to its isolated route, then delete them
+    from the shared collection.
+
+    Returns:
+        int: number of points moved
+    """
+
+    route = route_for(project_id)
+    if not route.isolated:
+        raise ValueError("Set QDRANT_TENANCY_MODE=sharded before migrating")
+
+    moved = 0
+    for points in _scroll({
+        "limit": config.QDRANT_UPSERT_BATCH_SIZE,
+        "with_payload": True,
+        "with_vector": True,
+        "filter": _project_filter(project_id),
+    }):
+        batch = [
+            {"id": p["id"], "vector": p["vector"], "payload": p["payload"]}
+            for p in points
+        ]
+
+        ensure_route(route, len(batch[0]["vector"]))
+        request_with_retry(
+            "PUT",
+            f"{route.base_url}/points?wait=true",
+            json=route.body({"points": batch}),
+            timeout=config.QDRANT_TIMEOUT_SECONDS,
+        )
+        moved += len(batch)
+
+    if moved:
+        request_with_retry(
+            "POST",
+            f"{_shared_route().base_url}/points/delete?wait=true",
+            json={"filter": _project_filter(project_id)},
+            timeout=config.QDRANT_TIMEOUT_SECONDS,
+        )
+
+    return moved
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("project_ids", nargs="*")
+    parser.add_argument("--all", action="store_true", help="migrate every project in the shared collection")
+    args = parser.parse_args(argv)
+
+    project_ids = sorted(list_shared_projects()) if args.all else args.project_ids
+    if not project_ids:
+        parser.error("give project ids or --all")
+
+    for project_id in project_ids:
+        moved = migrate_project(project_id)
+        print(f"MIGRATED: {project_id} -> {route_for(project_id)} ({moved} points)")
+
+
+if __name__ == "__main__":
+    main()
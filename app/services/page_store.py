@@ -0,0 +1,204 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlparse, urlunparse
+
+import app.config as config
+
+
+# ================== CONSTANTS ==================
+
+_EVICT_INTERVAL_SECONDS = 60
+
+_last_evicted_at = 0.0
+_evict_lock = threading.Lock()
+
+# ===============================================
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form used as the store key: lowercase scheme and host,
+    no fragment, no trailing slash.
+    """
+
+    parsed = urlparse(url.split("#")[0])
+    canonical = urlunparse(
+        parsed._replace(
+            scheme=parsed.scheme.lower(),
+            netloc=parsed.netloc.lower(),
+        )
+    )
+    return canonical.rstrip("/")
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+
+
+def _project_dir(project_id: str) -> str:
+    return os.path.join(config.PAGE_STORE_DIR, _digest(project_id))
+
+
+def _page_path(project_id: str, url: str) -> str:
+    return os.path.join(_project_dir(project_id), f"{_digest(canonical_url(url))}.json.gz")
+
+
+def _expired(path: str, now: float) -> bool:
+    ttl = config.PAGE_STORE_TTL_SECONDS
+    return bool(ttl) and now - os.path.getmtime(path) > ttl
+
+
+# ================== WRITE ==================
+
+def put_page(project_id: str, url: str, html: str, text: str) -> None:
+    """
+    Store the raw HTML and extracted text of a crawled page.
+    """
+
+    path = _page_path(project_id, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    record = {
+        # Exact crawl URL: /rechunk reuses it as the point url, so it must
+        # match what /ingest upserted (canonical_url is only the file key)
+        "url": url,
+        "html": html,
+        "text": text,
+        "fetched_at": time.time(),
+    }
+
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(record, f)
+    os.replace(tmp_path, path)
+
+    _maybe_evict()
+
+
+def delete_project_pages(project_id: str) -> None:
+    """
+    Drop every cached page of a project.
+    """
+    shutil.rmtree(_project_dir(project_id), ignore_errors=True)
+
+
+# ================== READ ==================
+
+def _read(path: str) -> Optional[Dict]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_page(project_id: str, url: str) -> Optional[Dict]:
+    """
+    Cached page for url, or None if missing or expired.
+    """
+
+    path = _page_path(project_id, url)
+    try:
+        if _expired(path, time.time()):
+            return None
+    except FileNotFoundError:
+        return None
+    return _read(path)
+
+
+def iter_pages(project_id: str) -> Iterator[Dict]:
+    """
+    Yield every non-expired cached page of a project:
+    { "url", "html", "text", "fetched_at" }
+    """
+
+    project_dir = _project_dir(project_id)
+    now = time.time()
+
+    try:
+        names = sorted(os.listdir(project_dir))
+    except FileNotFoundError:
+        return
+
+    for name in names:
+        if not name.endswith(".json.gz"):
+            continue
+
+        path = os.path.join(project_dir, name)
+        try:
+            if _expired(path, now):
+                continue
+        except FileNotFoundError:
+            continue
+
+        record = _read(path)
+        if record:
+            yield record
+
+
+# ================== EVICTION ==================
+
+def evict() -> None:
+    """
+    Remove expired pages, then the oldest pages until the store fits
+    PAGE_STORE_MAX_BYTES.
+    """
+
+    root = config.PAGE_STORE_DIR
+    now = time.time()
+    files = []
+
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            ttl = config.PAGE_STORE_TTL_SECONDS
+            if ttl and now - st.st_mtime > ttl:
+                _remove(path)
+                continue
+
+            files.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    if total <= config.PAGE_STORE_MAX_BYTES:
+        return
+
+    files.sort()
+    for _, size, path in files:
+        if total <= config.PAGE_STORE_MAX_BYTES:
+            break
+        _remove(path)
+        total -= size
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _maybe_evict() -> None:
+    global _last_evicted_at
+
+    now = time.monotonic()
+    if now - _last_evicted_at < _EVICT_INTERVAL_SECONDS:
+        return
+    if not _evict_lock.acquire(blocking=False):
+        return
+
+    try:
+        _last_evicted_at = now
+        evict()
+    finally:
+        _evict_lock.release()
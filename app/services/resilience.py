@@ -0,0 +1,307 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+
+import app.config as config
+
+
+# ================== ERRORS ==================
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised without calling the backend while its circuit is open.
+    """
+
+
+def _is_backend_failure(exc: BaseException) -> bool:
+    # Client errors (bad request, auth, ...) say nothing about backend health
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status >= 500 or status == 429
+    return True
+
+
+# ================== CIRCUIT BREAKER ==================
+
+class CircuitBreaker:
+    """
+    closed -> open after failure_threshold consecutive failures;
+    open -> half_open after reset_seconds, letting a single probe through;
+    half_open -> closed on probe success, back to open on probe failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    self.rejected += 1
+                    raise CircuitOpenError("circuit open")
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError("circuit half-open, probe in flight")
+                self._probe_in_flight = True
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def on_neutral(self) -> None:
+        # The call proved nothing either way (e.g. a 4xx): free the probe
+        # slot without changing state
+        with self._lock:
+            self._probe_in_flight = False
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "rejected_calls": self.rejected,
+            }
+
+
+# ================== LATENCY ==================
+
+class LatencyTracker:
+    """
+    Sliding window of recent successful call latencies.
+    """
+
+    def __init__(self, window: int, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# ================== BACKEND ==================
+
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+_hedge_pool_lock = threading.Lock()
+_hedge_slots = threading.BoundedSemaphore(config.HEDGE_MAX_WORKERS)
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(
+                max_workers=config.HEDGE_MAX_WORKERS,
+                thread_name_prefix="hedge",
+            )
+        return _hedge_pool
+
+
+def _start_primary(fn: Callable, args, kwargs) -> Future:
+    """
+    Run the primary request on a thread of its own, so it never queues
+    behind hedges and its caller can still return if the hedge wins.
+    """
+
+    future: Future = Future()
+
+    def _run():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    threading.Thread(target=_run, name="hedge-primary", daemon=True).start()
+    return future
+
+
+def _run_hedge(fn: Callable, args, kwargs):
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _hedge_slots.release()
+
+
+class Backend:
+    """
+    Resilience wrapper for one remote dependency (Gemini, Qdrant).
+
+    Every call goes through the circuit breaker. Idempotent calls are
+    hedged: if the first request has not answered after the backend's
+    HEDGE_PERCENTILE (p95 by default) latency, a duplicate is sent and
+    the first success wins. The losing request finishes in the background.
+    Duplicates run in a bounded pool and are skipped while it is full.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker(
+            config.BREAKER_FAILURE_THRESHOLD,
+            config.BREAKER_RESET_SECONDS,
+        )
+        self.latency = LatencyTracker(config.HEDGE_LATENCY_WINDOW)
+
+        self.calls = 0
+        self.hedges_sent = 0
+        self.hedges_skipped = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable, *args, idempotent: bool = False, **kwargs):
+        self.breaker.before_call()
+
+        with self._lock:
+            self.calls += 1
+
+        try:
+            if idempotent and config.HEDGE_ENABLED:
+                result = self._hedged(fn, args, kwargs)
+            else:
+                t0 = time.monotonic()
+                result = fn(*args, **kwargs)
+                self.latency.record(time.monotonic() - t0)
+
+        except Exception as e:
+            if _is_backend_failure(e):
+                self.breaker.on_failure()
+            else:
+                self.breaker.on_neutral()
+            raise
+
+        self.breaker.on_success()
+        return result
+
+    def _hedge_delay(self) -> Optional[float]:
+        threshold = self.latency.percentile(config.HEDGE_PERCENTILE)
+        if threshold is None:
+            return None
+        return max(threshold, config.HEDGE_MIN_DELAY_MS / 1000)
+
+    def _hedged(self, fn: Callable, args, kwargs):
+        delay = self._hedge_delay()
+        if delay is None:
+            # Not enough samples yet to know what "slow" means
+            t0 = time.monotonic()
+            result = fn(*args, **kwargs)
+            self.latency.record(time.monotonic() - t0)
+            return result
+
+        t0 = time.monotonic()
+
+        primary = _start_primary(fn, args, kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            self.latency.record(time.monotonic() - t0)
+            return primary.result()
+
+        # Every slot held by a slow request: the backend is degraded and a
+        # duplicate would only add load, so just wait for the primary
+        if not _hedge_slots.acquire(blocking=False):
+            with self._lock:
+                self.hedges_skipped += 1
+            result = primary.result()
+            self.latency.record(time.monotonic() - t0)
+            return result
+
+        with self._lock:
+            self.hedges_sent += 1
+        hedge = _get_hedge_pool().submit(_run_hedge, fn, args, kwargs)
+
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+
+                self.latency.record(time.monotonic() - t0)
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return future.result()
+
+        raise error
+
+    def snapshot(self) -> dict:
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+
+        with self._lock:
+            return {
+                "breaker": self.breaker.snapshot(),
+                "calls": self.calls,
+                "hedges_sent": self.hedges_sent,
+                "hedges_skipped": self.hedges_skipped,
+                "hedge_wins": self.hedge_wins,
+                "hedge_win_rate": (self.hedge_wins / self.hedges_sent) if self.hedges_sent else None,
+                "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+
+
+# ================== REGISTRY ==================
+
+_backends: Dict[str, Backend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name: str) -> Backend:
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = Backend(name)
+            _backends[name] = backend
+        return backend
+
+
+def backend_stats() -> Dict[str, dict]:
+    """
+    Breaker state and hedge statistics of every backend used so far.
+    """
+
+    with _backends_lock:
+        backends = list(_backends.values())
+    return {b.name: b.snapshot() for b in backends}
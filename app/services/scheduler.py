@@ -0,0 +1,256 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Dict, Optional
+
+import app.config as config
+
+
+# ================== CONSTANTS ==================
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BULK: "bulk",
+}
+
+# ===============================================
+
+
+class _Job:
+    __slots__ = ("project_id", "cost", "fn", "args", "kwargs", "future", "start_tag", "finish_tag")
+
+    def __init__(self, project_id, cost, fn, args, kwargs):
+        self.project_id = project_id
+        self.cost = cost
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+        self.start_tag = 0.0
+        self.finish_tag = 0.0
+
+
+class _ProjectState:
+    def __init__(self, tokens_per_minute: int):
+        self.queues: Dict[int, Deque[_Job]] = {p: deque() for p in PRIORITY_NAMES}
+        self.last_finish: Dict[int, float] = {p: 0.0 for p in PRIORITY_NAMES}
+        self.running = 0
+        self.tokens = float(tokens_per_minute)
+        self.refilled_at = time.monotonic()
+
+    def idle(self) -> bool:
+        return self.running == 0 and not any(self.queues.values())
+
+
+class FairScheduler:
+    """
+    Weighted fair queue for embedding / upsert work, keyed by project_id.
+
+    Each project gets a share of the worker pool proportional to its weight,
+    bounded by a per-project concurrency cap and a token-per-minute bucket.
+    Interactive jobs are always dispatched ahead of bulk jobs.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        project_concurrency: int,
+        tokens_per_minute: int,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        self.workers = max(1, workers)
+        self.project_concurrency = max(1, project_concurrency)
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self.weights = weights or {}
+
+        self._cond = threading.Condition()
+        self._projects: Dict[str, _ProjectState] = {}
+        self._virtual_time: Dict[int, float] = {p: 0.0 for p in PRIORITY_NAMES}
+        self._threads: list = []
+
+    # ---------- public API ----------
+
+    def submit(
+        self,
+        project_id: str,
+        cost: int,
+        fn: Callable,
+        *args,
+        priority: int = PRIORITY_BULK,
+        **kwargs,
+    ) -> Future:
+        """
+        Queue fn(*args, **kwargs) on behalf of project_id.
+
+        cost is the number of tokens the job will send to the embedding API.
+        """
+
+        if priority not in PRIORITY_NAMES:
+            raise ValueError(f"Unknown priority: {priority}")
+
+        job = _Job(project_id, max(0, int(cost)), fn, args, kwargs)
+
+        with self._cond:
+            self._ensure_workers()
+            state = self._project(project_id)
+
+            weight = self.weights.get(project_id, 1.0)
+            job.start_tag = max(self._virtual_time[priority], state.last_finish[priority])
+            job.finish_tag = job.start_tag + max(job.cost, 1) / weight
+            state.last_finish[priority] = job.finish_tag
+
+            state.queues[priority].append(job)
+            self._cond.notify()
+
+        return job.future
+
+    def run(self, project_id: str, cost: int, fn: Callable, *args, **kwargs):
+        """
+        Submit a job and block until it completes.
+        """
+        return self.submit(project_id, cost, fn, *args, **kwargs).result()
+
+    def queue_depths(self) -> Dict[str, Dict[str, int]]:
+        """
+        Snapshot of queued and running jobs per project.
+        """
+
+        with self._cond:
+            snapshot = {}
+            for project_id, state in self._projects.items():
+                entry = {
+                    name: len(state.queues[p])
+                    for p, name in PRIORITY_NAMES.items()
+                }
+                entry["running"] = state.running
+                snapshot[project_id] = entry
+            return snapshot
+
+    # ---------- internals ----------
+
+    def _project(self, project_id: str) -> _ProjectState:
+        state = self._projects.get(project_id)
+        if state is None:
+            state = _ProjectState(self.tokens_per_minute)
+            self._projects[project_id] = state
+        return state
+
+    def _ensure_workers(self) -> None:
+        # Threads are started lazily so that importing this module
+        # (e.g. before a pre-fork) never spawns anything.
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            t = threading.Thread(
+                target=self._worker,
+                name=f"fair-scheduler-{len(self._threads)}",
+                daemon=True,
+            )
+            t.start()
+            self._threads.append(t)
+
+    def _refill(self, state: _ProjectState, now: float) -> None:
+        if not self.tokens_per_minute:
+            return
+        elapsed = now - state.refilled_at
+        state.refilled_at = now
+        state.tokens = min(
+            float(self.tokens_per_minute),
+            state.tokens + elapsed * self.tokens_per_minute / 60.0,
+        )
+
+    def _token_wait(self, state: _ProjectState, cost: int) -> float:
+        """
+        Seconds until the bucket can cover cost (0 if it already can).
+        Jobs larger than the whole bucket run once the bucket is full.
+        """
+
+        if not self.tokens_per_minute:
+            return 0.0
+        needed = min(cost, self.tokens_per_minute)
+        if state.tokens >= needed:
+            return 0.0
+        return (needed - state.tokens) * 60.0 / self.tokens_per_minute
+
+    def _pick(self):
+        """
+        Pick the next eligible job, or return the time to wait before retrying.
+        """
+
+        now = time.monotonic()
+        wait: Optional[float] = None
+
+        for priority in PRIORITY_NAMES:
+            best: Optional[_Job] = None
+            best_state: Optional[_ProjectState] = None
+
+            for state in self._projects.values():
+                queue = state.queues[priority]
+                if not queue or state.running >= self.project_concurrency:
+                    continue
+
+                head = queue[0]
+                self._refill(state, now)
+                delay = self._token_wait(state, head.cost)
+                if delay > 0:
+                    wait = delay if wait is None else min(wait, delay)
+                    continue
+
+                if best is None or head.finish_tag < best.finish_tag:
+                    best, best_state = head, state
+
+            if best is not None:
+                best_state.queues[priority].popleft()
+                best_state.running += 1
+                if self.tokens_per_minute:
+                    best_state.tokens -= best.cost
+                self._virtual_time[priority] = max(self._virtual_time[priority], best.start_tag)
+                return best, None
+
+        return None, wait
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    job, wait = self._pick()
+                    if job is not None:
+                        break
+                    self._cond.wait(timeout=wait)
+
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.fn(*job.args, **job.kwargs))
+                except BaseException as e:
+                    job.future.set_exception(e)
+
+            with self._cond:
+                state = self._projects[job.project_id]
+                state.running -= 1
+                self._refill(state, time.monotonic())
+                if state.idle() and state.tokens >= self.tokens_per_minute:
+                    del self._projects[job.project_id]
+                self._cond.notify_all()
+
+
+# ================== SINGLETON ==================
+
+_scheduler: Optional[FairScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> FairScheduler:
+    global _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FairScheduler(
+                workers=config.SCHEDULER_WORKERS,
+                project_concurrency=config.SCHEDULER_PROJECT_CONCURRENCY,
+                tokens_per_minute=config.SCHEDULER_PROJECT_TOKENS_PER_MINUTE,
+                weights=config.SCHEDULER_PROJECT_WEIGHTS,
+            )
+        return _scheduler
@@ -0,0 +1,258 @@
+import hashlib
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Set
+
+import app.config as config
+from app.services.http import get_session
+from app.services.resilience import CircuitOpenError, get_backend
+
+
+# ================== CONSTANTS ==================
+
+TENANCY_SHARED = "shared"
+TENANCY_SHARDED = "sharded"
+
+QDRANT_HEADERS = {
+    "Content-Type": "application/json",
+    "api-key": config.QDRANT_API_KEY,
+}
+
+# Collections / shard keys known to exist in this process
+_ensured: Set[tuple] = set()
+_ensure_lock = threading.Lock()
+
+# ===============================================
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    Where a project's points live.
+
+    shared:     the common collection, selected by payload filter
+    shard key:  the sharded collection, one custom shard per project
+    dedicated:  a collection of its own (large tenants)
+    """
+
+    collection: str
+    shard_key: Optional[str] = None
+
+    @property
+    def isolated(self) -> bool:
+        # Isolated routes hold a single project and can be dropped whole
+        return self.shard_key is not None or self.collection != config.QDRANT_COLLECTION_NAME
+
+    @property
+    def base_url(self) -> str:
+        return f"{config.QDRANT_URL}/collections/{self.collection}"
+
+    def body(self, payload: dict) -> dict:
+        """
+        Add the shard key selector to a points API request body.
+        """
+        if self.shard_key is None:
+            return payload
+        return {**payload, "shard_key": self.shard_key}
+
+
+def dedicated_collection_name(project_id: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9_-]", "_", project_id)[:48]
+    digest = hashlib.sha256(project_id.encode("utf-8")).hexdigest()[:8]
+    return f"{config.QDRANT_COLLECTION_NAME}__{slug}_{digest}"
+
+
+def route_for(project_id: str) -> Route:
+    """
+    Resolve the route of a project under the configured tenancy mode.
+    """
+
+    if config.QDRANT_TENANCY_MODE != TENANCY_SHARDED:
+        return Route(collection=config.QDRANT_COLLECTION_NAME)
+
+    if project_id in config.QDRANT_DEDICATED_PROJECTS:
+        return Route(collection=dedicated_collection_name(project_id))
+
+    return Route(
+        collection=config.QDRANT_SHARDED_COLLECTION_NAME,
+        shard_key=project_id,
+    )
+
+
+# ================== QDRANT CALLS ==================
+
+def _request(method: str, url: str, json=None, timeout: int = 15):
+    res = get_session("qdrant").request(
+        method,
+        url,
+        headers=QDRANT_HEADERS,
+        json=json,
+        timeout=timeout,
+    )
+    res.raise_for_status()
+    return res
+
+
+def _is_client_error(exc: BaseException) -> bool:
+    # A 4xx (other than 429) will fail the same way again
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+def request_with_retry(
+    method: str,
+    url: str,
+    json=None,
+    timeout: int = 15,
+    idempotent: bool = True,
+):
+    """
+    Qdrant request through the "qdrant" circuit breaker; idempotent
+    requests (scroll, count, search, delete by id / filter) may be hedged.
+    Client errors are raised at once, without retrying.
+    """
+
+    qdrant = get_backend("qdrant")
+
+    for attempt in range(3):
+        try:
+            return qdrant.call(
+                _request,
+                method,
+                url,
+                json=json,
+                timeout=timeout,
+                idempotent=idempotent,
+            )
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            if attempt == 2 or _is_client_error(e):
+                raise
+            time.sleep(1.5)
+
+
+def _create_if_missing(method: str, url: str, json: dict) -> None:
+    res = get_session("qdrant").request(
+        method,
+        url,
+        headers=QDRANT_HEADERS,
+        json=json,
+        timeout=config.QDRANT_TIMEOUT_SECONDS,
+    )
+
+    # Anything else (bad distance, size mismatch, ...) is a real error
+    if res.status_code == 409 or (
+        res.status_code == 400 and "already exists" in res.text.lower()
+    ):
+        return
+    res.raise_for_status()
+
+
+def ensure_route(route: Route, vector_size: int) -> None:
+    """
+    Lazily create the collection and shard key of an isolated route.
+    """
+
+    if not route.isolated:
+        return
+
+    key = (route.collection, route.shard_key)
+    if key in _ensured:
+        return
+
+    with _ensure_lock:
+        if key in _ensured:
+            return
+
+        if (route.collection, None) not in _ensured:
+            collection = {
+                "vectors": {
+                    "size": vector_size,
+                    "distance": config.QDRANT_DISTANCE,
+                },
+            }
+            if route.shard_key is not None:
+                collection["sharding_method"] = "custom"
+
+            _create_if_missing("PUT", route.base_url, collection)
+            _ensured.add((route.collection, None))
+
+        if route.shard_key is not None:
+            _create_if_missing(
+                "PUT",
+                f"{route.base_url}/shards",
+                {"shard_key": route.shard_key},
+            )
+
+        _ensured.add(key)
+
+
+def forget_route(route: Route) -> None:
+    """
+    Drop a route from this process's cache of created collections /
+    shard keys, so the next ensure_route creates it again.
+    """
+
+    with _ensure_lock:
+        _ensured.discard((route.collection, route.shard_key))
+        _ensured.discard((route.collection, None))
+
+
+def is_missing_route_error(exc: BaseException) -> bool:
+    """
+    True for a Qdrant error saying the collection or shard key does not
+    exist, e.g. after another worker dropped the project's route.
+    """
+
+    response = getattr(exc, "response", None)
+    if response is None or response.status_code not in (400, 404):
+        return False
+
+    text = response.text.lower()
+    return "not found" in text or "does not exist" in text or "doesn't exist" in text
+
+
+def count_points(route: Route, project_id: str) -> int:
+    """
+    Exact number of points a project has on its route.
+    """
+
+    response = request_with_retry(
+        "POST",
+        f"{route.base_url}/points/count",
+        json=route.body({
+            "exact": True,
+            "filter": {
+                "must": [
+                    {"key": "project_id", "match": {"value": project_id}},
+                ]
+            },
+        }),
+    )
+    return response.json().get("result", {}).get("count", 0)
+
+
+def drop_route(route: Route) -> None:
+    """
+    Drop a project's shard key or dedicated collection in one call.
+    """
+
+    if not route.isolated:
+        raise ValueError("The shared collection cannot be dropped per project")
+
+    if route.shard_key is not None:
+        request_with_retry(
+            "POST",
+            f"{route.base_url}/shards/delete",
+            json={"shard_key": route.shard_key},
+            idempotent=False,
+        )
+    else:
+        request_with_retry("DELETE", route.base_url, idempotent=False)
+        _ensured.discard((route.collection, None))
+
+    _ensured.discard((route.collection, route.shard_key))
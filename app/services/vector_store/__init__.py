@@ -0,0 +1,39 @@
+import threading
+from typing import Optional
+
+import app.config as config
+from app.services.vector_store.base import VectorStore
+
+
+_store: Optional[VectorStore] = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStore:
+    """
+    Configured vector-store backend (VECTOR_STORE_BACKEND), created once.
+    """
+
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            backend = config.VECTOR_STORE_BACKEND
+
+            if backend == "qdrant":
+                from app.services.vector_store.qdrant import QdrantStore
+
+                _store = QdrantStore()
+
+            elif backend == "local":
+                from app.services.vector_store.local import LocalStore
+
+                _store = LocalStore(config.LOCAL_VECTOR_STORE_DIR)
+
+            else:
+                raise RuntimeError(f"❌ Unknown VECTOR_STORE_BACKEND: {backend}")
+
+        return _store
+
+
+__all__ = ["VectorStore", "get_vector_store"]
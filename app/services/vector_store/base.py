@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+from typing import Collection, Dict, Iterator, List, Optional
+
+
+class VectorStore(ABC):
+    """
+    Storage backend for chunk vectors.
+
+    Points are dicts of { "id": str, "vector": List[float], "payload": dict }
+    and every operation is scoped to a single project_id.
+    """
+
+    @abstractmethod
+    def upsert(self, project_id: str, points: List[dict]) -> None:
+        """
+        Insert or overwrite a batch of points.
+        """
+
+    @abstractmethod
+    def scroll_ids(self, project_id: str) -> List[str]:
+        """
+        IDs of every point of a project.
+        """
+
+    @abstractmethod
+    def iter_payloads(self, project_id: str, batch_size: int) -> Iterator[List[Dict]]:
+        """
+        Every point of a project without vectors, in batches of
+        [{ "id", "payload" }].
+        """
+
+    @abstractmethod
+    def replace_payloads(self, project_id: str, payloads: Dict[str, dict]) -> None:
+        """
+        Overwrite the whole payload of each point in payloads (by ID).
+        """
+
+    @abstractmethod
+    def delete(
+        self,
+        project_id: str,
+        url: Optional[str] = None,
+        keep_ids: Collection[str] = (),
+    ) -> None:
+        """
+        Delete a project's points matching url (all urls if None),
+        except keep_ids.
+        """
+
+    @abstractmethod
+    def delete_project(self, project_id: str) -> int:
+        """
+        Delete every point of a project.
+
+        Returns:
+            int: number of deleted points
+        """
+
+    @abstractmethod
+    def count(self, project_id: str) -> int:
+        """
+        Number of points of a project.
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        project_id: str,
+        vector: List[float],
+        limit: int = 5,
+    ) -> List[Dict]:
+        """
+        Nearest points to vector: [{ "id", "score", "payload" }], best first.
+        """
@@ -0,0 +1,294 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from typing import Collection, Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+import numpy as np
+
+import app.config as config
+from app.services.content_store import attach_content
+from app.services.vector_store.base import VectorStore
+
+
+# ================== CONSTANTS ==================
+
+# Rows scored per step during search (bounds temporary memory)
+_SEARCH_BLOCK_ROWS = 65_536
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    id TEXT PRIMARY KEY,
+    row INTEGER NOT NULL UNIQUE,
+    url TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS points_url ON points (url);
+CREATE TABLE IF NOT EXISTS free_rows (row INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# ===============================================
+
+
+class LocalStore(VectorStore):
+    """
+    Embedded, in-process vector store.
+
+    Each project lives in its own directory:
+      vectors.f32   row-major float32 matrix, memory-mapped for search
+      meta.sqlite   point id -> row, url and payload; free (deleted) rows
+
+    Vectors are L2-normalised on write, so cosine similarity is a single
+    vectorised dot product over the memory map. Deleted rows are reused
+    by later inserts; dropping a project removes its directory.
+
+    Writes take a per-project thread lock and an exclusive flock, so
+    several worker processes can share one root without handing out the
+    same row. Reads take no lock: they use a read-only SQLite snapshot of
+    the points, and every committed row's vector was written beforehand.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ---------- layout ----------
+
+    def _project_dir(self, project_id: str) -> str:
+        digest = hashlib.sha256(project_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.root, digest)
+
+    def _vectors_path(self, project_id: str) -> str:
+        return os.path.join(self._project_dir(project_id), "vectors.f32")
+
+    @contextmanager
+    def _write_lock(self, project_id: str) -> Iterator[None]:
+        with self._locks_guard:
+            lock = self._locks.setdefault(project_id, threading.Lock())
+
+        # Kept beside (not inside) the project dir, which delete_project removes
+        os.makedirs(self.root, exist_ok=True)
+        path = f"{self._project_dir(project_id)}.lock"
+
+        with lock, open(path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _connect(self, project_id: str, create: bool = False) -> Optional[sqlite3.Connection]:
+        path = os.path.join(self._project_dir(project_id), "meta.sqlite")
+
+        if not os.path.exists(path):
+            if not create:
+                return None
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        conn = sqlite3.connect(path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _query(self, project_id: str, sql: str, params=()) -> list:
+        """
+        Read-only query; a missing (or just dropped) project reads as empty.
+        """
+
+        path = os.path.join(self._project_dir(project_id), "meta.sqlite")
+        try:
+            with closing(sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)) as conn:
+                return conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            return []
+
+    @staticmethod
+    def _dim(conn: sqlite3.Connection) -> Optional[int]:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    @staticmethod
+    def _next_row(conn: sqlite3.Connection) -> int:
+        free = conn.execute("SELECT row FROM free_rows LIMIT 1").fetchone()
+        if free:
+            conn.execute("DELETE FROM free_rows WHERE row = ?", free)
+            return free[0]
+
+        last = conn.execute(
+            "SELECT MAX(m) FROM ("
+            " SELECT MAX(row) AS m FROM points"
+            " UNION ALL SELECT MAX(row) FROM free_rows)"
+        ).fetchone()[0]
+        return 0 if last is None else last + 1
+
+    # ---------- VectorStore ----------
+
+    def upsert(self, project_id: str, points: List[dict]) -> None:
+        if not points:
+            return
+
+        vectors = np.asarray([p["vector"] for p in points], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        with self._write_lock(project_id), closing(self._connect(project_id, create=True)) as conn, conn:
+            dim = self._dim(conn)
+            if dim is None:
+                dim = vectors.shape[1]
+                conn.execute("INSERT INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+            elif dim != vectors.shape[1]:
+                raise ValueError(f"Vector size {vectors.shape[1]} does not match project dimension {dim}")
+
+            path = self._vectors_path(project_id)
+            mode = "r+b" if os.path.exists(path) else "w+b"
+
+            with open(path, mode) as f:
+                for point, vector in zip(points, vectors):
+                    existing = conn.execute(
+                        "SELECT row FROM points WHERE id = ?", (str(point["id"]),)
+                    ).fetchone()
+                    row = existing[0] if existing else self._next_row(conn)
+
+                    f.seek(row * dim * 4)
+                    f.write(vector.tobytes())
+
+                    payload = point.get("payload") or {}
+                    conn.execute(
+                        "INSERT OR REPLACE INTO points (id, row, url, payload) VALUES (?, ?, ?, ?)",
+                        (str(point["id"]), row, payload.get("url"), json.dumps(payload)),
+                    )
+
+                f.flush()
+                os.fsync(f.fileno())
+
+    def scroll_ids(self, project_id: str) -> List[str]:
+        return [r[0] for r in self._query(project_id, "SELECT id FROM points ORDER BY row")]
+
+    def iter_payloads(self, project_id: str, batch_size: int) -> Iterator[List[Dict]]:
+        rows = self._query(project_id, "SELECT id, payload FROM points ORDER BY row")
+
+        for i in range(0, len(rows), batch_size):
+            yield [{"id": pid, "payload": json.loads(payload)} for pid, payload in rows[i : i + batch_size]]
+
+    def replace_payloads(self, project_id: str, payloads: Dict[str, dict]) -> None:
+        if not payloads:
+            return
+
+        with self._write_lock(project_id):
+            conn = self._connect(project_id)
+            if conn is None:
+                return
+            with closing(conn), conn:
+                conn.executemany(
+                    "UPDATE points SET url = ?, payload = ? WHERE id = ?",
+                    [
+                        (payload.get("url"), json.dumps(payload), str(pid))
+                        for pid, payload in payloads.items()
+                    ],
+                )
+
+    def delete(
+        self,
+        project_id: str,
+        url: Optional[str] = None,
+        keep_ids: Collection[str] = (),
+    ) -> None:
+        with self._write_lock(project_id):
+            conn = self._connect(project_id)
+            if conn is None:
+                return
+
+            with closing(conn), conn:
+                query = "SELECT id, row FROM points"
+                params: list = []
+                if url is not None:
+                    query += " WHERE url = ?"
+                    params.append(url)
+
+                keep = set(map(str, keep_ids))
+                doomed = [(pid, row) for pid, row in conn.execute(query, params) if pid not in keep]
+
+                conn.executemany("DELETE FROM points WHERE id = ?", [(pid,) for pid, _ in doomed])
+                conn.executemany("INSERT INTO free_rows (row) VALUES (?)", [(row,) for _, row in doomed])
+
+    def delete_project(self, project_id: str) -> int:
+        with self._write_lock(project_id):
+            count = self.count(project_id)
+            shutil.rmtree(self._project_dir(project_id), ignore_errors=True)
+            return count
+
+    def count(self, project_id: str) -> int:
+        rows = self._query(project_id, "SELECT COUNT(*) FROM points")
+        return rows[0][0] if rows else 0
+
+    def search(
+        self,
+        project_id: str,
+        vector: List[float],
+        limit: int = 5,
+    ) -> List[Dict]:
+        dim_rows = self._query(project_id, "SELECT value FROM meta WHERE key = 'dim'")
+        dim = int(dim_rows[0][0]) if dim_rows else None
+        rows = dict(self._query(project_id, "SELECT row, id FROM points"))
+
+        if not dim or not rows:
+            return []
+
+        # Rows committed before the snapshot above were written to the file
+        # first, so its current size always covers them
+        path = self._vectors_path(project_id)
+        try:
+            n_rows = os.path.getsize(path) // (dim * 4)
+            matrix = np.memmap(path, dtype=np.float32, mode="r", shape=(n_rows, dim))
+        except (FileNotFoundError, ValueError):
+            # Dropped meanwhile
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        live = np.zeros(n_rows, dtype=bool)
+        live[[r for r in rows if r < n_rows]] = True
+
+        scores = np.empty(n_rows, dtype=np.float32)
+        for start in range(0, n_rows, _SEARCH_BLOCK_ROWS):
+            block = matrix[start : start + _SEARCH_BLOCK_ROWS]
+            scores[start : start + len(block)] = block @ query
+        scores[~live] = -np.inf
+
+        k = min(limit, int(live.sum()))
+        if k <= 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        hits = [(rows[int(r)], float(scores[r])) for r in top]
+
+        payloads = {
+            pid: json.loads(payload)
+            for pid, payload in self._query(
+                project_id,
+                f"SELECT id, payload FROM points WHERE id IN ({','.join('?' * len(hits))})",
+                [pid for pid, _ in hits],
+            )
+        }
+
+        results = [
+            {"id": pid, "score": score, "payload": payloads.get(pid, {})}
+            for pid, score in hits
+            if pid in payloads
+        ]
+
+        if config.CONTENT_STORE_ENABLED:
+            attach_content(results)
+
+        return results
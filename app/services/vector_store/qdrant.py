@@ -0,0 +1,250 @@
+from typing import Collection, Dict, Iterator, List, Optional
+
+import requests
+
+import app.config as config
+from app.services.content_store import attach_content
+from app.services.http import get_session
+from app.services.resilience import get_backend
+from app.services.tenancy import (
+    QDRANT_HEADERS,
+    Route,
+    count_points,
+    drop_route,
+    ensure_route,
+    forget_route,
+    is_missing_route_error,
+    request_with_retry,
+    route_for,
+)
+from app.services.vector_store.base import VectorStore
+
+
+def _project_filter(project_id: str, url: Optional[str] = None) -> dict:
+    must = [{"key": "project_id", "match": {"value": project_id}}]
+    if url is not None:
+        must.append({"key": "url", "match": {"value": url}})
+    return {"must": must}
+
+
+def _put_points(url: str, body: dict) -> None:
+    response = get_session("qdrant").put(
+        url,
+        headers=QDRANT_HEADERS,
+        json=body,
+        timeout=30,
+    )
+
+    response.raise_for_status()
+
+
+class QdrantStore(VectorStore):
+    """
+    Qdrant over REST. Each project is routed to the shared collection,
+    its shard key or its dedicated collection (see app.services.tenancy).
+    """
+
+    def upsert(self, project_id: str, points: List[dict]) -> None:
+        if not points:
+            return
+
+        route = route_for(project_id)
+
+        for attempt in range(2):
+            ensure_route(route, len(points[0]["vector"]))
+
+            try:
+                # Point IDs are deterministic, so a duplicated upsert is harmless
+                get_backend("qdrant").call(
+                    _put_points,
+                    f"{route.base_url}/points",
+                    route.body({"points": points}),
+                    idempotent=True,
+                )
+                return
+
+            except requests.HTTPError as e:
+                # Route dropped by another worker: recreate it once
+                if attempt == 1 or not route.isolated or not is_missing_route_error(e):
+                    raise
+                forget_route(route)
+
+    def _scroll(self, project_id: str, route: Route) -> List[str]:
+        """
+        Fetch all Qdrant point IDs for a given project_id using scroll API.
+        Cloud-Qdrant safe.
+        """
+
+        point_ids: List[str] = []
+        offset: Optional[str] = None
+
+        while True:
+            payload = {
+                "limit": config.QDRANT_SCROLL_LIMIT,
+                "with_payload": False,
+                "filter": _project_filter(project_id),
+            }
+
+            if offset:
+                payload["offset"] = offset
+
+            response = request_with_retry(
+                "POST",
+                f"{route.base_url}/points/scroll",
+                json=route.body(payload),
+                timeout=15,
+            )
+
+            result = response.json().get("result", {})
+            points = result.get("points", [])
+
+            if not points:
+                break
+
+            for p in points:
+                point_ids.append(p["id"])
+
+            offset = result.get("next_page_offset")
+            if not offset:
+                break
+
+        return point_ids
+
+    def scroll_ids(self, project_id: str) -> List[str]:
+        return self._scroll(project_id, route_for(project_id))
+
+    def iter_payloads(self, project_id: str, batch_size: int) -> Iterator[List[Dict]]:
+        route = route_for(project_id)
+        offset: Optional[str] = None
+
+        while True:
+            payload = {
+                "limit": batch_size,
+                "with_payload": True,
+                "with_vector": False,
+                "filter": _project_filter(project_id),
+            }
+
+            if offset:
+                payload["offset"] = offset
+
+            response = request_with_retry(
+                "POST",
+                f"{route.base_url}/points/scroll",
+                json=route.body(payload),
+                timeout=config.QDRANT_TIMEOUT_SECONDS,
+            )
+
+            result = response.json().get("result", {})
+            points = result.get("points", [])
+
+            if not points:
+                break
+
+            yield [{"id": p["id"], "payload": p.get("payload") or {}} for p in points]
+
+            offset = result.get("next_page_offset")
+            if not offset:
+                break
+
+    def replace_payloads(self, project_id: str, payloads: Dict[str, dict]) -> None:
+        if not payloads:
+            return
+
+        route = route_for(project_id)
+
+        # One batch request instead of a payload call per point
+        operations = [
+            {"overwrite_payload": route.body({"payload": payload, "points": [pid]})}
+            for pid, payload in payloads.items()
+        ]
+
+        request_with_retry(
+            "POST",
+            f"{route.base_url}/points/batch?wait=true",
+            json={"operations": operations},
+            timeout=config.QDRANT_TIMEOUT_SECONDS,
+        )
+
+    def delete(
+        self,
+        project_id: str,
+        url: Optional[str] = None,
+        keep_ids: Collection[str] = (),
+    ) -> None:
+        point_filter = _project_filter(project_id, url)
+        if keep_ids:
+            point_filter["must_not"] = [{"has_id": list(keep_ids)}]
+
+        route = route_for(project_id)
+
+        request_with_retry(
+            "POST",
+            f"{route.base_url}/points/delete",
+            json=route.body({"filter": point_filter}),
+            timeout=15,
+        )
+
+    def delete_project(self, project_id: str) -> int:
+        route = route_for(project_id)
+
+        if route.isolated:
+            # Own shard key / collection: count, then drop it in one call
+            count = self.count(project_id)
+            if count:
+                drop_route(route)
+            return count
+
+        point_ids = self._scroll(project_id, route)
+
+        if not point_ids:
+            return 0
+
+        request_with_retry(
+            "POST",
+            f"{route.base_url}/points/delete",
+            json={"points": point_ids},
+            timeout=15,
+        )
+
+        return len(point_ids)
+
+    def count(self, project_id: str) -> int:
+        try:
+            return count_points(route_for(project_id), project_id)
+        except requests.HTTPError as e:
+            # Isolated route never written to, or already dropped
+            # (404 for a collection, 400 for a custom shard key)
+            if is_missing_route_error(e):
+                return 0
+            raise
+
+    def search(
+        self,
+        project_id: str,
+        vector: List[float],
+        limit: int = 5,
+    ) -> List[Dict]:
+        route = route_for(project_id)
+
+        response = request_with_retry(
+            "POST",
+            f"{route.base_url}/points/search",
+            json=route.body({
+                "vector": vector,
+                "limit": limit,
+                "with_payload": True,
+                "filter": _project_filter(project_id),
+            }),
+            timeout=config.QDRANT_TIMEOUT_SECONDS,
+        )
+
+        hits = [
+            {"id": p["id"], "score": p["score"], "payload": p.get("payload") or {}}
+            for p in response.json().get("result", [])
+        ]
+
+        if config.CONTENT_STORE_ENABLED:
+            attach_content(hits)
+
+        return hits
@@ -0,0 +1,76 @@
+import gc
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+# ================== TIMING ==================
+
+_started_at = time.perf_counter()
+_phases: Dict[str, float] = {}
+
+
+@contextmanager
+def timed(phase: str):
+    """
+    Record the wall time of a startup phase (import / init / warmup step).
+    """
+
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[phase] = round((time.perf_counter() - t0) * 1000, 2)
+
+
+def mark_ready() -> None:
+    """
+    Record total startup time, measured from the first app import.
+    """
+    _phases["total"] = round((time.perf_counter() - _started_at) * 1000, 2)
+
+
+def startup_report() -> dict:
+    """
+    Breakdown of import and initialization cost, in milliseconds.
+    """
+
+    phases = dict(_phases)
+    total = phases.pop("total", None)
+
+    return {
+        "phases_ms": phases,
+        "total_ms": total,
+    }
+
+
+# ================== WARMUP ==================
+
+def warmup() -> None:
+    """
+    Preload heavy, fork-safe state: tokenizer tables, HTML / PDF parsers
+    and the HTTP client stack.
+
+    Meant to run in the master before workers are forked (gunicorn
+    --preload), so the loaded pages are shared copy-on-write. HTTP
+    connection pools themselves are rebuilt per process after the fork.
+    """
+
+    from app.services.chunk import get_encoder
+    from app.services.http import get_session
+
+    with timed("warmup:tokenizer"):
+        get_encoder().encode("warmup")
+
+    with timed("warmup:parsers"):
+        import bs4  # noqa: F401
+        import PyPDF2  # noqa: F401
+
+    with timed("warmup:http"):
+        get_session("gemini")
+        get_session("qdrant")
+        get_session()
+
+    # Move everything loaded so far into the permanent generation, so the
+    # cyclic GC in forked workers never touches (and un-shares) those pages
+    gc.freeze()
@@ -0,0 +1,13 @@
+# Pre-fork alternative to the uvicorn Procfile entry:
+#
+#   web: STARTUP_WARMUP=true gunicorn app.main:app -c gunicorn.conf.py
+#
+# With preload_app the app (and, with STARTUP_WARMUP, the tokenizer,
+# parsers and HTTP stack) is loaded once in the master and shared
+# copy-on-write by every forked worker.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True